@@ -29,6 +29,11 @@ def clear_database():
         cursor.execute("DELETE FROM students")
         cursor.execute("DELETE FROM grading_config")
         
+        # Forget finished imports too, or reloading the same files would be skipped
+        cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table' AND name = 'import_journal'")
+        if cursor.fetchone():
+            cursor.execute("DELETE FROM import_journal")
+        
         # Reset auto-increment counters
         cursor.execute("DELETE FROM sqlite_sequence WHERE name IN ('students', 'attendance', 'grades', 'grading_config')")
         
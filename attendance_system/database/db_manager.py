@@ -1,21 +1,155 @@
 import os
+import re
+import json
 import sys
 import sqlite3
-from typing import List, Tuple, Optional, Dict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, List, Tuple, Optional, Dict, Set
 
 
 class DBManager:
     """Manages all database operations for the attendance system"""
 
-    def __init__(self, db_path: str = None):
-        """Initialize database connection"""
+    # Bumped whenever run_migrations() gains a new one-time step
+    SCHEMA_VERSION = 5
+
+    # Secondary indexes created and checked at startup: name -> (table, columns, unique)
+    INDEXES = {
+        'idx_students_name': ('students', ('name',), False),
+        'idx_students_active_name': ('students', ('active', 'name', 'student_id'), False),
+        'idx_attendance_student_date': ('attendance', ('student_id', 'date'), True),
+        'idx_attendance_date': ('attendance', ('date', 'student_id', 'status'), False),
+        'idx_grades_student_type': ('grades', ('student_id', 'assessment_type', 'score', 'max_score'), False),
+        'idx_grades_date': ('grades', ('date',), False),
+    }
+
+    # Single write path for attendance: one row per student per day
+    UPSERT_ATTENDANCE = """
+                        INSERT INTO attendance (student_id, date, status)
+                        VALUES (?, ?, ?)
+                        ON CONFLICT (student_id, date) DO UPDATE SET status = excluded.status
+                        """
+
+    # PRAGMA settings applied to each connection, selected by name
+    CONNECTION_PROFILES = {
+        # Interactive use: readers never wait on writers, commits skip the
+        # per-transaction fsync (WAL stays consistent, checkpoints still sync)
+        'default': {
+            'journal_mode': 'WAL',
+            'synchronous': 'NORMAL',
+            'cache_size': -16000,  # negative values are KiB, so 16 MB
+            'mmap_size': 64 * 1024 * 1024,
+            'temp_store': 'MEMORY',
+            'busy_timeout': 5000,
+            'wal_autocheckpoint': 1000,
+        },
+        # Imports: bigger cache and memory map, fewer checkpoints while
+        # large batches stream in, longer wait for a busy UI connection
+        'bulk_load': {
+            'journal_mode': 'WAL',
+            'synchronous': 'NORMAL',
+            'cache_size': -128000,
+            'mmap_size': 256 * 1024 * 1024,
+            'temp_store': 'MEMORY',
+            'busy_timeout': 30000,
+            'wal_autocheckpoint': 10000,
+        },
+        # Read-only snapshots for exports: no journal or checkpoint settings,
+        # since a mode=ro connection may not change them
+        'read_only': {
+            'cache_size': -64000,
+            'mmap_size': 256 * 1024 * 1024,
+            'temp_store': 'MEMORY',
+            'busy_timeout': 5000,
+        },
+    }
+
+    # Environment variable that picks a profile when none is passed in
+    PROFILE_ENV_VAR = 'ATTENDANCE_DB_PROFILE'
+
+    # Days covered by the weekly attendance view
+    WEEK_DAYS = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday']
+
+    # Read paths covered by verify_query_plans(): (method name, sample arguments)
+    QUERY_PLAN_CHECKS = [
+        ('get_all_students', ()),
+        ('get_student', ('',)),
+        ('student_exists', ('',)),
+        ('get_students_with_attendance', ()),
+        ('get_attendance_stats', ('',)),
+        ('get_all_attendance_stats', ()),
+        ('get_attendance_by_day', ('',)),
+        ('get_attendance_matrix', ('2024-01-01', '2024-01-06')),
+        ('iter_attendance_records', ()),
+        ('get_attendance_dates', ()),
+        ('iter_attendance_pivot', ()),
+        ('get_all_grades', ()),
+        ('get_student_grades_by_type', ('', 'Quizzes')),
+        ('get_all_grade_averages', ()),
+    ]
+
+    # Tables verify_query_plans() may scan whole: one row per student, so
+    # reading all of them is the point rather than a missing index
+    FULL_SCAN_TABLES = {'attendance_summary', 'grade_aggregates'}
+
+    def __init__(self, db_path: str = None, profile: str = None, read_only: bool = False):
+        """
+        Initialize database connection
+        The connection profile comes from the profile argument, then the
+        ATTENDANCE_DB_PROFILE environment variable, then 'default'.
+
+        With read_only the database is opened with mode=ro, tables are not
+        created or migrated, and every read runs in one transaction, so the
+        connection sees a single snapshot however long it is kept open.
+        """
         if db_path is None:
             db_path = self._get_database_path()
+        if profile is None:
+            profile = 'read_only' if read_only else os.environ.get(self.PROFILE_ENV_VAR, 'default')
+        if profile not in self.CONNECTION_PROFILES:
+            raise ValueError(f"Unknown connection profile: {profile}")
 
         self.db_path = db_path
-        self.conn = sqlite3.connect(db_path)
+        self.profile = profile
+        self.read_only = read_only
+        self._transaction_depth = 0
+        self._connect()
+        if read_only:
+            self._begin_snapshot()
+        else:
+            self.init_tables()
+
+    def _connect(self):
+        """Open the connection and apply the current profile"""
+        if self.read_only:
+            uri = Path(self.db_path).resolve().as_uri() + '?mode=ro'
+            self.conn = sqlite3.connect(uri, uri=True)
+        else:
+            self.conn = sqlite3.connect(self.db_path)
         self.cursor = self.conn.cursor()
-        self.init_tables()
+        self.apply_profile(self.profile)
+
+    def _begin_snapshot(self):
+        """Open the read transaction that pins a read-only connection's snapshot"""
+        # A deferred transaction takes its snapshot at the first read
+        self.cursor.execute("BEGIN")
+        self.cursor.execute("SELECT COUNT(*) FROM sqlite_master")
+        self.cursor.fetchall()
+
+    def apply_profile(self, profile: str):
+        """
+        Apply a connection profile's PRAGMA settings
+        Must be called outside a transaction, since journal_mode cannot
+        change while one is open
+        """
+        if profile not in self.CONNECTION_PROFILES:
+            raise ValueError(f"Unknown connection profile: {profile}")
+
+        for pragma, value in self.CONNECTION_PROFILES[profile].items():
+            self.cursor.execute(f"PRAGMA {pragma} = {value}")
+            self.cursor.fetchall()
+        self.profile = profile
 
     def _get_database_path(self) -> str:
         """
@@ -135,6 +269,35 @@ class DBManager:
                                 )
                             """)
 
+        # Per-student attendance counters, kept in sync by the triggers below
+        self.cursor.execute("""
+                            CREATE TABLE IF NOT EXISTS attendance_summary
+                            (
+                                student_id TEXT PRIMARY KEY,
+                                total      INTEGER NOT NULL DEFAULT 0,
+                                present    INTEGER NOT NULL DEFAULT 0,
+                                late       INTEGER NOT NULL DEFAULT 0,
+                                excused    INTEGER NOT NULL DEFAULT 0,
+                                absent     INTEGER NOT NULL DEFAULT 0
+                            )
+                            """)
+        self.init_attendance_summary_triggers()
+
+        # Per-student, per-component grade percentages, kept in sync by triggers
+        self.cursor.execute("""
+                            CREATE TABLE IF NOT EXISTS grade_aggregates
+                            (
+                                student_id      TEXT NOT NULL,
+                                assessment_type TEXT NOT NULL,
+                                count           INTEGER NOT NULL,
+                                pct_sum         REAL NOT NULL,
+                                min_pct         REAL,
+                                max_pct         REAL,
+                                PRIMARY KEY (student_id, assessment_type)
+                            )
+                            """)
+        self.init_grade_aggregate_triggers()
+
         # Grading configuration table
         self.cursor.execute("""
                             CREATE TABLE IF NOT EXISTS grading_config
@@ -167,60 +330,441 @@ class DBManager:
                 default_config
             )
 
+        # Progress of chunked imports, so an interrupted file can resume
+        self.cursor.execute("""
+                            CREATE TABLE IF NOT EXISTS import_journal
+                            (
+                                file_hash   TEXT NOT NULL,
+                                import_type TEXT NOT NULL,
+                                filename    TEXT,
+                                rows_done   INTEGER NOT NULL DEFAULT 0,
+                                chunks_done INTEGER NOT NULL DEFAULT 0,
+                                imported    INTEGER NOT NULL DEFAULT 0,
+                                skipped     INTEGER NOT NULL DEFAULT 0,
+                                status      TEXT NOT NULL DEFAULT 'running',
+                                updated_at  TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                                PRIMARY KEY (file_hash, import_type)
+                            )
+                            """)
+
+        self.run_migrations()
+        self.ensure_indexes()
         self.conn.commit()
 
-    # ==================== STUDENT OPERATIONS ====================
+    # ==================== TRANSACTIONS ====================
 
-    def add_student(self, student_id: str, name: str, course: str = "", email: str = "") -> bool:
-        """Add a new student"""
+    @contextmanager
+    def transaction(self):
+        """
+        Group several operations into a single commit
+        Methods called inside the block skip their own commits. Nested
+        blocks become savepoints, so a failure inside one only undoes that
+        block's work; a failure reaching the outermost block rolls back all.
+        """
+        depth = self._transaction_depth
+        savepoint = f"sp_{depth}"
+        if depth == 0:
+            if not self.conn.in_transaction:
+                self.cursor.execute("BEGIN")
+        else:
+            self.cursor.execute(f"SAVEPOINT {savepoint}")
+
+        self._transaction_depth += 1
         try:
+            yield self
+        except BaseException:
+            self._transaction_depth -= 1
+            if depth == 0:
+                self.conn.rollback()
+            else:
+                self.cursor.execute(f"ROLLBACK TO {savepoint}")
+                self.cursor.execute(f"RELEASE {savepoint}")
+            raise
+        else:
+            self._transaction_depth -= 1
+            if depth == 0:
+                self.conn.commit()
+            else:
+                self.cursor.execute(f"RELEASE {savepoint}")
+
+    def _commit(self):
+        """Commit unless an enclosing transaction() block will do it"""
+        if self._transaction_depth == 0:
+            self.conn.commit()
+
+    # ==================== MIGRATIONS ====================
+
+    def run_migrations(self):
+        """Apply one-time migrations tracked in PRAGMA user_version"""
+        self.cursor.execute("PRAGMA user_version")
+        version = self.cursor.fetchone()[0]
+
+        if version < 1:
+            # Duplicate roll calls must go before the unique index can exist;
+            # keep the most recent mark for each student and day
+            self.cursor.execute("""
+                                DELETE
+                                FROM attendance
+                                WHERE id NOT IN (SELECT MAX(id)
+                                                 FROM attendance
+                                                 GROUP BY student_id, date)
+                                """)
+
+        if version < 2:
+            # Summary table is new; fill it from the existing history
+            self.rebuild_attendance_summary(commit=False)
+
+        if version < 3:
+            self.rebuild_grade_aggregates(commit=False)
+
+        if version < 4:
+            # Roster sync deactivates students instead of deleting their history
+            self.cursor.execute("ALTER TABLE students ADD COLUMN active INTEGER NOT NULL DEFAULT 1")
+
+        if version < 5:
+            # Rows an import rejected, so a rerun can retry just those
+            self.cursor.execute("ALTER TABLE import_journal ADD COLUMN rejected TEXT")
+
+        if version < self.SCHEMA_VERSION:
+            self.cursor.execute(f"PRAGMA user_version = {self.SCHEMA_VERSION}")
+
+    # ==================== ATTENDANCE SUMMARY ====================
+
+    def init_attendance_summary_triggers(self):
+        """Create the triggers that keep attendance_summary in step with attendance"""
+        # Each status column gains or loses 1 when a row with that status comes or goes
+        increment = """
+                    INSERT INTO attendance_summary (student_id, total, present, late, excused, absent)
+                    VALUES (NEW.student_id, 1, NEW.status = 'Present', NEW.status = 'Late',
+                            NEW.status = 'Excused', NEW.status = 'Absent')
+                    ON CONFLICT (student_id) DO UPDATE SET total   = total + 1,
+                                                           present = present + excluded.present,
+                                                           late    = late + excluded.late,
+                                                           excused = excused + excluded.excused,
+                                                           absent  = absent + excluded.absent;
+                    """
+        decrement = """
+                    UPDATE attendance_summary
+                    SET total   = total - 1,
+                        present = present - (OLD.status = 'Present'),
+                        late    = late - (OLD.status = 'Late'),
+                        excused = excused - (OLD.status = 'Excused'),
+                        absent  = absent - (OLD.status = 'Absent')
+                    WHERE student_id = OLD.student_id;
+                    """
+        self.cursor.execute(f"""
+                            CREATE TRIGGER IF NOT EXISTS trg_attendance_summary_insert
+                                AFTER INSERT ON attendance
+                            BEGIN
+                                {increment}
+                            END
+                            """)
+        self.cursor.execute(f"""
+                            CREATE TRIGGER IF NOT EXISTS trg_attendance_summary_update
+                                AFTER UPDATE OF student_id, status ON attendance
+                            BEGIN
+                                {decrement}
+                                {increment}
+                            END
+                            """)
+        self.cursor.execute(f"""
+                            CREATE TRIGGER IF NOT EXISTS trg_attendance_summary_delete
+                                AFTER DELETE ON attendance
+                            BEGIN
+                                {decrement}
+                            END
+                            """)
+
+    def rebuild_attendance_summary(self, commit: bool = True):
+        """Recompute attendance_summary from the attendance table (repair tool)"""
+        self.cursor.execute("DELETE FROM attendance_summary")
+        self.cursor.execute("""
+                            INSERT INTO attendance_summary (student_id, total, present, late, excused, absent)
+                            SELECT student_id,
+                                   COUNT(*),
+                                   SUM(status = 'Present'),
+                                   SUM(status = 'Late'),
+                                   SUM(status = 'Excused'),
+                                   SUM(status = 'Absent')
+                            FROM attendance
+                            GROUP BY student_id
+                            """)
+        if commit:
+            self._commit()
+
+    # ==================== INDEXES ====================
+
+    def get_index_definition(self, index_name: str) -> Optional[Tuple[str, Tuple[str, ...], bool]]:
+        """Get (table, columns, unique) for an existing index, or None if it is missing"""
+        self.cursor.execute(
+            "SELECT tbl_name FROM sqlite_master WHERE type = 'index' AND name = ?",
+            (index_name,)
+        )
+        row = self.cursor.fetchone()
+        if row is None:
+            return None
+        table = row[0]
+
+        self.cursor.execute(f"PRAGMA index_info('{index_name}')")
+        columns = tuple(info[2] for info in sorted(self.cursor.fetchall()))
+
+        self.cursor.execute(f"PRAGMA index_list('{table}')")
+        unique = any(entry[1] == index_name and entry[2] for entry in self.cursor.fetchall())
+
+        return table, columns, unique
+
+    def check_indexes(self) -> List[str]:
+        """Get the declared indexes that are missing or differ from their declaration"""
+        return [
+            name for name, definition in self.INDEXES.items()
+            if self.get_index_definition(name) != definition
+        ]
+
+    def ensure_indexes(self):
+        """Create missing declared indexes and rebuild any that have drifted"""
+        for name in self.check_indexes():
+            table, columns, unique = self.INDEXES[name]
+            self.cursor.execute(f"DROP INDEX IF EXISTS {name}")
             self.cursor.execute(
-                "INSERT INTO students (student_id, name, course, email) VALUES (?, ?, ?, ?)",
-                (student_id, name, course, email)
+                f"CREATE {'UNIQUE ' if unique else ''}INDEX {name} ON {table} ({', '.join(columns)})"
             )
-            self.conn.commit()
-            return True
-        except sqlite3.IntegrityError:
-            return False
+
+    def explain_query_plan(self, sql: str, params: Tuple = ()) -> List[str]:
+        """Get the EXPLAIN QUERY PLAN steps for a statement"""
+        self.cursor.execute("EXPLAIN QUERY PLAN " + sql, params)
+        return [row[3] for row in self.cursor.fetchall()]
+
+    def verify_query_plans(self) -> Dict[str, List[str]]:
+        """
+        Run every read path in QUERY_PLAN_CHECKS and inspect its query plans.
+        Returns the plan steps that scan a whole table or need an automatic
+        index, keyed by method name. An empty dict means every query is
+        served by an index.
+        """
+        problems = {}
+        for method_name, args in self.QUERY_PLAN_CHECKS:
+            statements = []
+            self.conn.set_trace_callback(statements.append)
+            try:
+                result = getattr(self, method_name)(*args)
+                # Generators only run their query once iterated
+                if hasattr(result, '__next__'):
+                    for _ in result:
+                        pass
+            finally:
+                self.conn.set_trace_callback(None)
+
+            for sql in statements:
+                if not sql.lstrip().upper().startswith('SELECT'):
+                    continue
+                for step in self.explain_query_plan(sql):
+                    full_scan = re.match(r'SCAN (\w+)$', step)
+                    if full_scan and full_scan.group(1) in self.FULL_SCAN_TABLES:
+                        continue
+                    if full_scan or 'AUTOMATIC' in step:
+                        problems.setdefault(method_name, []).append(step)
+        return problems
+
+    # ==================== GRADE AGGREGATES ====================
+
+    def init_grade_aggregate_triggers(self):
+        """Create the triggers that keep grade_aggregates in step with grades"""
+        # New grades fold straight into the running count, sum, min and max.
+        # Rows with a zero max score have no percentage and are left out,
+        # just as AVG() skips them.
+        self.cursor.execute("""
+                            CREATE TRIGGER IF NOT EXISTS trg_grade_aggregates_insert
+                                AFTER INSERT ON grades
+                            BEGIN
+                                INSERT INTO grade_aggregates (student_id, assessment_type, count, pct_sum, min_pct, max_pct)
+                                SELECT NEW.student_id, NEW.assessment_type, 1, pct, pct, pct
+                                FROM (SELECT NEW.score * 100.0 / NEW.max_score AS pct)
+                                WHERE pct IS NOT NULL
+                                ON CONFLICT (student_id, assessment_type) DO UPDATE SET
+                                    count   = count + 1,
+                                    pct_sum = pct_sum + excluded.pct_sum,
+                                    min_pct = MIN(min_pct, excluded.min_pct),
+                                    max_pct = MAX(max_pct, excluded.max_pct);
+                            END
+                            """)
+
+        # A removed grade may have been the minimum or maximum, so its
+        # (student, type) group is recomputed from the covering index
+        def recompute(row):
+            return f"""
+                    DELETE FROM grade_aggregates
+                    WHERE student_id = {row}.student_id
+                      AND assessment_type = {row}.assessment_type;
+                    INSERT INTO grade_aggregates (student_id, assessment_type, count, pct_sum, min_pct, max_pct)
+                    SELECT student_id, assessment_type, COUNT(pct), SUM(pct), MIN(pct), MAX(pct)
+                    FROM (SELECT student_id, assessment_type, score * 100.0 / max_score AS pct
+                          FROM grades
+                          WHERE student_id = {row}.student_id
+                            AND assessment_type = {row}.assessment_type)
+                    GROUP BY student_id, assessment_type
+                    HAVING COUNT(pct) > 0;
+                    """
+
+        self.cursor.execute(f"""
+                            CREATE TRIGGER IF NOT EXISTS trg_grade_aggregates_update
+                                AFTER UPDATE OF student_id, assessment_type, score, max_score ON grades
+                            BEGIN
+                                {recompute('OLD')}
+                                {recompute('NEW')}
+                            END
+                            """)
+        self.cursor.execute(f"""
+                            CREATE TRIGGER IF NOT EXISTS trg_grade_aggregates_delete
+                                AFTER DELETE ON grades
+                            BEGIN
+                                {recompute('OLD')}
+                            END
+                            """)
+
+    def rebuild_grade_aggregates(self, commit: bool = True):
+        """Recompute grade_aggregates from the grades table (repair tool)"""
+        self.cursor.execute("DELETE FROM grade_aggregates")
+        self.cursor.execute("""
+                            INSERT INTO grade_aggregates (student_id, assessment_type, count, pct_sum, min_pct, max_pct)
+                            SELECT student_id, assessment_type, COUNT(pct), SUM(pct), MIN(pct), MAX(pct)
+                            FROM (SELECT student_id, assessment_type, score * 100.0 / max_score AS pct
+                                  FROM grades)
+                            GROUP BY student_id, assessment_type
+                            HAVING COUNT(pct) > 0
+                            """)
+        if commit:
+            self._commit()
+
+    # ==================== STUDENT OPERATIONS ====================
+
+    def add_student(self, student_id: str, name: str, course: str = "", email: str = "") -> bool:
+        """
+        Add a new student
+        A student deactivated by a roster sync is reactivated with the new
+        details, keeping their history; an active duplicate returns False
+        """
+        self.cursor.execute("""
+                            INSERT INTO students (student_id, name, course, email)
+                            VALUES (?, ?, ?, ?)
+                            ON CONFLICT (student_id) DO UPDATE SET name   = excluded.name,
+                                                                   course = excluded.course,
+                                                                   email  = excluded.email,
+                                                                   active = 1
+                            WHERE active = 0
+                            """, (student_id, name, course, email))
+        added = self.cursor.rowcount > 0
+        self._commit()
+        return added
+
+    def add_students_bulk(self, students: Iterable[Tuple[str, str, str, str]]):
+        """
+        Add (student_id, name, course, email) rows with one executemany
+        Deactivated students are reactivated with the new details, as in add_student
+        """
+        with self.transaction():
+            self.cursor.executemany("""
+                                    INSERT INTO students (student_id, name, course, email)
+                                    VALUES (?, ?, ?, ?)
+                                    ON CONFLICT (student_id) DO UPDATE SET name   = excluded.name,
+                                                                           course = excluded.course,
+                                                                           email  = excluded.email,
+                                                                           active = 1
+                                    WHERE active = 0
+                                    """, students)
 
     def get_all_students(self) -> List[Tuple]:
-        """Get all students"""
-        self.cursor.execute("SELECT student_id, name, course, email FROM students ORDER BY name")
+        """Get all active students"""
+        self.cursor.execute("SELECT student_id, name, course, email FROM students WHERE active = 1 ORDER BY name")
         return self.cursor.fetchall()
 
+    def get_roster(self) -> List[Tuple]:
+        """Get every student, active or not, as (student_id, name, course, email, active)"""
+        self.cursor.execute("SELECT student_id, name, course, email, active FROM students")
+        return self.cursor.fetchall()
+
+    def apply_roster_changes(self, inserted: Iterable[Tuple[str, str, str, str]],
+                             updated: Iterable[Tuple[str, str, str, str]],
+                             deactivated: Iterable[str]):
+        """
+        Apply a roster delta in a single transaction
+        inserted and updated hold (student_id, name, course, email) rows;
+        updated students are also reactivated. Deactivated students keep
+        their attendance and grade history.
+        """
+        with self.transaction():
+            self.cursor.executemany(
+                "INSERT INTO students (student_id, name, course, email) VALUES (?, ?, ?, ?)",
+                inserted
+            )
+            self.cursor.executemany(
+                "UPDATE students SET name = ?, course = ?, email = ?, active = 1 WHERE student_id = ?",
+                ((name, course, email, student_id) for student_id, name, course, email in updated)
+            )
+            self.cursor.executemany(
+                "UPDATE students SET active = 0 WHERE student_id = ?",
+                ((student_id,) for student_id in deactivated)
+            )
+
     def get_student(self, student_id: str) -> Optional[Tuple]:
-        """Get a specific student"""
-        self.cursor.execute("SELECT student_id, name, course, email FROM students WHERE student_id = ?", (student_id,))
+        """Get a specific active student"""
+        self.cursor.execute("SELECT student_id, name, course, email FROM students WHERE student_id = ? AND active = 1",
+                            (student_id,))
         return self.cursor.fetchone()
 
+    def get_student_ids(self) -> Set[str]:
+        """Get every active student_id in one query"""
+        self.cursor.execute("SELECT student_id FROM students WHERE active = 1")
+        return {row[0] for row in self.cursor.fetchall()}
+
     def student_exists(self, student_id: str) -> bool:
         """Check if a student exists by student_id"""
         self.cursor.execute("SELECT id FROM students WHERE student_id = ?", (student_id,))
         return self.cursor.fetchone() is not None
 
     def get_students_with_attendance(self) -> List[Tuple]:
-        """Get students with attendance statistics"""
-        self.cursor.execute("""
-                            SELECT s.student_id,
-                                   s.name,
-                                   s.course,
-                                   s.email,
-                                   COUNT(a.id)                                           as total_days,
-                                   SUM(CASE WHEN a.status = 'Present' THEN 1 ELSE 0 END) as present_days
-                            FROM students s
-                                     LEFT JOIN attendance a ON s.student_id = a.student_id
-                            GROUP BY s.student_id
-                            ORDER BY s.name
-                            """)
-        return self.cursor.fetchall()
+        """
+        Get students with attendance statistics
+        Rows are (student_id, name, course, email, total, present, absent)
+        """
+        return list(self.iter_students_with_attendance())
+
+    def iter_students_with_attendance(self, batch_size: int = 1000) -> Iterator[Tuple]:
+        """
+        Stream active students with attendance statistics, ordered by name
+        Yields the same rows as get_students_with_attendance, batch_size at
+        a time from a cursor of its own.
+        """
+        cursor = self.conn.cursor()
+        try:
+            cursor.execute("""
+                           SELECT s.student_id,
+                                  s.name,
+                                  s.course,
+                                  s.email,
+                                  COALESCE(a.total, 0)   as total_days,
+                                  COALESCE(a.present, 0) as present_days,
+                                  COALESCE(a.absent, 0)  as absent_days
+                           FROM students s
+                                    LEFT JOIN attendance_summary a ON s.student_id = a.student_id
+                           WHERE s.active = 1
+                           ORDER BY s.name
+                           """)
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    return
+                yield from rows
+        finally:
+            cursor.close()
 
     def delete_student(self, student_id: str) -> bool:
         """Delete a student and all related records"""
         try:
-            self.cursor.execute("DELETE FROM students WHERE student_id = ?", (student_id,))
-            self.cursor.execute("DELETE FROM attendance WHERE student_id = ?", (student_id,))
-            self.cursor.execute("DELETE FROM grades WHERE student_id = ?", (student_id,))
-            self.conn.commit()
+            with self.transaction():
+                self.cursor.execute("DELETE FROM students WHERE student_id = ?", (student_id,))
+                self.cursor.execute("DELETE FROM attendance WHERE student_id = ?", (student_id,))
+                self.cursor.execute("DELETE FROM attendance_summary WHERE student_id = ?", (student_id,))
+                self.cursor.execute("DELETE FROM grades WHERE student_id = ?", (student_id,))
             return True
         except Exception:
             return False
@@ -228,91 +772,193 @@ class DBManager:
     # ==================== ATTENDANCE OPERATIONS ====================
 
     def mark_attendance(self, student_id: str, date: str, status: str):
-        """Mark attendance for a student"""
-        self.cursor.execute(
-            "INSERT INTO attendance (student_id, date, status) VALUES (?, ?, ?)",
-            (student_id, date, status)
+        """Mark attendance for a student, replacing any earlier mark for that day"""
+        self.cursor.execute(self.UPSERT_ATTENDANCE, (student_id, date, status))
+        self._commit()
+
+    def mark_attendance_bulk(self, date: str, statuses: Dict[str, str]):
+        """Mark attendance for a whole roll call in a single transaction"""
+        self._upsert_attendance_rows(
+            [(student_id, date, status) for student_id, status in statuses.items()]
         )
-        self.conn.commit()
+
+    def add_attendance_bulk(self, records: Iterable[Tuple[str, str, str]]):
+        """Insert or update (student_id, date, status) records in a single transaction"""
+        self._upsert_attendance_rows(records)
+
+    def _upsert_attendance_rows(self, rows: Iterable[Tuple[str, str, str]]):
+        """Write (student_id, date, status) rows atomically with executemany"""
+        # Never leave half a class marked
+        with self.transaction():
+            self.cursor.executemany(self.UPSERT_ATTENDANCE, rows)
 
     def get_attendance_stats(self, student_id: str) -> Tuple[int, int]:
         """Get attendance statistics for a student"""
         self.cursor.execute("""
-                            SELECT COUNT(*)                                            as total,
-                                   SUM(CASE WHEN status = 'Present' THEN 1 ELSE 0 END) as present
-                            FROM attendance
+                            SELECT total, present
+                            FROM attendance_summary
                             WHERE student_id = ?
                             """, (student_id,))
-        return self.cursor.fetchone()
+        return self.cursor.fetchone() or (0, 0)
 
-    def get_attendance_by_day(self, student_id: str) -> Dict[str, bool]:
-        """Get attendance status for each day of the week (Mon-Sat) for current week"""
-        from datetime import datetime, timedelta
+    def get_all_attendance_stats(self) -> Dict[str, Tuple[int, int]]:
+        """Get attendance statistics for every student from the summary table"""
+        self.cursor.execute("SELECT student_id, total, present FROM attendance_summary")
+        return {student_id: (total, present) for student_id, total, present in self.cursor.fetchall()}
 
-        # Get current week (Monday to Saturday)
-        today = datetime.now()
-        # Get Monday of current week
-        days_since_monday = today.weekday()
-        monday = today - timedelta(days=days_since_monday)
+    def get_attendance_matrix(self, start_date: str, end_date: str,
+                              student_ids: List[str] = None) -> Tuple[List[str], Dict[str, int]]:
+        """
+        Get a students x dates attendance grid for a date range in one query
+        Returns every date from start_date to end_date (YYYY-MM-DD) and a
+        bitmask per student where bit i is set if they were Present on
+        dates[i]. Covers the active roster unless student_ids is given.
+        """
+        from datetime import datetime, timedelta
 
-        days_of_week = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday']
-        attendance_dict = {day: False for day in days_of_week}
+        start = datetime.strptime(start_date, "%Y-%m-%d")
+        end = datetime.strptime(end_date, "%Y-%m-%d")
+        dates = [(start + timedelta(days=i)).strftime("%Y-%m-%d") for i in range((end - start).days + 1)]
+        positions = {date: i for i, date in enumerate(dates)}
 
-        # Get attendance records for current week
-        for i in range(6):  # Mon to Sat
-            day_date = (monday + timedelta(days=i)).strftime("%Y-%m-%d")
+        if student_ids is None:
+            masks = {}
             self.cursor.execute("""
-                                SELECT status
+                                SELECT s.student_id, a.date, a.status
+                                FROM students s
+                                         LEFT JOIN attendance a
+                                                   ON a.student_id = s.student_id
+                                                       AND a.date BETWEEN ? AND ?
+                                WHERE s.active = 1
+                                """, (start_date, end_date))
+        else:
+            masks = {student_id: 0 for student_id in student_ids}
+            self.cursor.execute("""
+                                SELECT student_id, date, status
                                 FROM attendance
-                                WHERE student_id = ? AND date = ?
-                                """, (student_id, day_date))
-            result = self.cursor.fetchone()
-            if result:
-                attendance_dict[days_of_week[i]] = (result[0] == 'Present')
+                                WHERE student_id IN (SELECT value FROM json_each(?))
+                                  AND date BETWEEN ? AND ?
+                                """, (json.dumps(list(student_ids)), start_date, end_date))
 
-        return attendance_dict
+        for student_id, date, status in self.cursor:
+            mask = masks.get(student_id, 0)
+            if status == 'Present' and date in positions:
+                mask |= 1 << positions[date]
+            masks[student_id] = mask
 
-    def mark_attendance_by_day(self, student_id: str, day_name: str, status: bool):
-        """Mark attendance for a specific day of the current week"""
+        return dates, masks
+
+    def mark_attendance_matrix(self, dates: List[str], masks: Dict[str, int],
+                               edited: Dict[str, int]):
+        """
+        Save an edited attendance grid in a single transaction
+        Each date whose bit is set in a student's edited mask is written as
+        Present or Absent from masks. Cells not marked as edited are left
+        alone, so Late and Excused marks survive and days without a session
+        gain no Absent rows.
+        """
+        rows = []
+        for student_id, mask in masks.items():
+            edited_mask = edited.get(student_id, 0)
+            for i, date in enumerate(dates):
+                if edited_mask >> i & 1:
+                    rows.append((student_id, date, "Present" if mask >> i & 1 else "Absent"))
+        self._upsert_attendance_rows(rows)
+
+    def _current_week_dates(self) -> List[str]:
+        """Get the dates of the current week from Monday to Saturday"""
         from datetime import datetime, timedelta
 
-        # Map day name to index
-        days_of_week = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday']
-        if day_name not in days_of_week:
-            return
+        today = datetime.now()
+        monday = today - timedelta(days=today.weekday())
+        return [(monday + timedelta(days=i)).strftime("%Y-%m-%d") for i in range(len(self.WEEK_DAYS))]
 
-        day_index = days_of_week.index(day_name)
+    def get_attendance_by_day(self, student_id: str) -> Dict[str, bool]:
+        """Get attendance status for each day of the week (Mon-Sat) for current week"""
+        week = self._current_week_dates()
+        _, masks = self.get_attendance_matrix(week[0], week[-1], [student_id])
+        mask = masks[student_id]
+        return {day: bool(mask >> i & 1) for i, day in enumerate(self.WEEK_DAYS)}
 
-        # Get Monday of current week
-        today = datetime.now()
-        days_since_monday = today.weekday()
-        monday = today - timedelta(days=days_since_monday)
-        day_date = (monday + timedelta(days=day_index)).strftime("%Y-%m-%d")
+    def mark_attendance_by_day(self, student_id: str, day_name: str, status: bool):
+        """Mark attendance for a specific day of the current week"""
+        if day_name not in self.WEEK_DAYS:
+            return
 
-        # Check if record exists
-        self.cursor.execute("""
-                            SELECT id
-                            FROM attendance
-                            WHERE student_id = ? AND date = ?
-                            """, (student_id, day_date))
+        day_date = self._current_week_dates()[self.WEEK_DAYS.index(day_name)]
 
         status_str = "Present" if status else "Absent"
+        self.cursor.execute(self.UPSERT_ATTENDANCE, (student_id, day_date, status_str))
+        self._commit()
 
-        if self.cursor.fetchone():
-            # Update existing record
-            self.cursor.execute("""
-                                UPDATE attendance
-                                SET status = ?
-                                WHERE student_id = ? AND date = ?
-                                """, (status_str, student_id, day_date))
-        else:
-            # Insert new record
-            self.cursor.execute("""
-                                INSERT INTO attendance (student_id, date, status)
-                                VALUES (?, ?, ?)
-                                """, (student_id, day_date, status_str))
+    def iter_attendance_records(self, batch_size: int = 1000) -> Iterator[Tuple[str, str, str, str, str]]:
+        """
+        Stream every attendance record of active students, newest date first
+        Yields (date, student_id, name, course, status) from one JOIN,
+        fetched batch_size rows at a time on a cursor of its own, so other
+        queries can run while the caller consumes it.
+        """
+        cursor = self.conn.cursor()
+        try:
+            # CROSS JOIN pins attendance as the outer loop, so rows come off
+            # idx_attendance_date already in date order and only each day's
+            # names are sorted, instead of the whole table
+            cursor.execute("""
+                           SELECT a.date, s.student_id, s.name, COALESCE(s.course, ''), a.status
+                           FROM attendance a
+                                    CROSS JOIN students s ON s.student_id = a.student_id
+                           WHERE s.active = 1
+                           ORDER BY a.date DESC, s.name
+                           """)
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    return
+                yield from rows
+        finally:
+            cursor.close()
+
+    def get_attendance_dates(self, start_date: str = None, end_date: str = None) -> List[str]:
+        """Get every date with attendance recorded, oldest first, optionally within a range"""
+        self.cursor.execute("""
+                            SELECT DISTINCT date
+                            FROM attendance
+                            WHERE date BETWEEN ? AND ?
+                            ORDER BY date
+                            """, (start_date or '', end_date or '9999-12-31'))
+        return [row[0] for row in self.cursor.fetchall()]
 
-        self.conn.commit()
+    def iter_attendance_pivot(self, start_date: str = None, end_date: str = None,
+                              batch_size: int = 1000) -> Iterator[Tuple[str, str, str, Dict[str, str]]]:
+        """
+        Stream the active roster with each student's attendance folded into one row
+        Yields (student_id, name, course, {date: status}) ordered by name.
+        group_concat collapses each student's records inside SQLite, so the
+        query returns one row per student rather than one per record.
+        """
+        cursor = self.conn.cursor()
+        try:
+            cursor.execute("""
+                           SELECT s.student_id,
+                                  s.name,
+                                  COALESCE(s.course, ''),
+                                  (SELECT group_concat(a.date || '=' || a.status)
+                                   FROM attendance a
+                                   WHERE a.student_id = s.student_id
+                                     AND a.date BETWEEN ? AND ?)
+                           FROM students s
+                           WHERE s.active = 1
+                           ORDER BY s.name
+                           """, (start_date or '', end_date or '9999-12-31'))
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    return
+                for student_id, name, course, records in rows:
+                    statuses = dict(record.split('=', 1) for record in records.split(',')) if records else {}
+                    yield student_id, name, course, statuses
+        finally:
+            cursor.close()
 
     def get_attendance_percentage(self, student_id: str) -> float:
         """Get attendance percentage for a student"""
@@ -328,44 +974,130 @@ class DBManager:
             "INSERT INTO grades (student_id, assessment_type, assessment_name, score, max_score, date) VALUES (?, ?, ?, ?, ?, ?)",
             (student_id, assessment_type, assessment_name, score, max_score, date)
         )
-        self.conn.commit()
+        self._commit()
+
+    def add_grades_bulk(self, grades: Iterable[Tuple[str, str, str, float, float, str]]):
+        """Add (student_id, assessment_type, assessment_name, score, max_score, date) rows with one executemany"""
+        with self.transaction():
+            self.cursor.executemany(
+                "INSERT INTO grades (student_id, assessment_type, assessment_name, score, max_score, date) VALUES (?, ?, ?, ?, ?, ?)",
+                grades
+            )
 
     def get_all_grades(self) -> List[Tuple]:
-        """Get all grades with student names"""
-        self.cursor.execute("""
-                            SELECT g.student_id,
-                                   s.name,
-                                   g.assessment_type,
-                                   g.assessment_name,
-                                   g.score,
-                                   g.max_score,
-                                   g.date
-                            FROM grades g
-                                     JOIN students s ON g.student_id = s.student_id
-                            ORDER BY g.date DESC, s.name
-                            """)
-        return self.cursor.fetchall()
+        """Get all grades of active students with their names"""
+        return list(self.iter_grades())
+
+    def iter_grades(self, batch_size: int = 1000) -> Iterator[Tuple]:
+        """
+        Stream the grades of active students with their names, newest date first
+        Yields the same rows as get_all_grades, batch_size at a time from
+        a cursor of its own.
+        """
+        cursor = self.conn.cursor()
+        try:
+            # Same join order trick as iter_attendance_records, on idx_grades_date
+            cursor.execute("""
+                           SELECT g.student_id,
+                                  s.name,
+                                  g.assessment_type,
+                                  g.assessment_name,
+                                  g.score,
+                                  g.max_score,
+                                  g.date
+                           FROM grades g
+                                    CROSS JOIN students s ON g.student_id = s.student_id
+                           WHERE s.active = 1
+                           ORDER BY g.date DESC, s.name
+                           """)
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    return
+                yield from rows
+        finally:
+            cursor.close()
 
     def get_student_grades_by_type(self, student_id: str, assessment_type: str) -> Optional[float]:
         """Get average grade for a student by assessment type"""
         self.cursor.execute("""
-                            SELECT AVG(score * 100.0 / max_score)
-                            FROM grades
+                            SELECT pct_sum / count
+                            FROM grade_aggregates
                             WHERE student_id = ?
                               AND assessment_type = ?
                             """, (student_id, assessment_type))
-        result = self.cursor.fetchone()[0]
-        return result if result else 0.0
+        result = self.cursor.fetchone()
+        return result[0] if result and result[0] else 0.0
+
+    def get_all_grade_averages(self) -> Dict[Tuple[str, str], float]:
+        """Get average grade for every (student, assessment type) pair from the aggregate table"""
+        self.cursor.execute("SELECT student_id, assessment_type, pct_sum / count FROM grade_aggregates")
+        return {(student_id, assessment_type): avg
+                for student_id, assessment_type, avg in self.cursor.fetchall()}
 
     def delete_grade(self, grade_id: int) -> bool:
         """Delete a grade entry"""
         try:
             self.cursor.execute("DELETE FROM grades WHERE id = ?", (grade_id,))
-            self.conn.commit()
+            self._commit()
             return True
         except Exception:
             return False
 
+    # ==================== IMPORT JOURNAL ====================
+
+    def get_import_journal(self, file_hash: str, import_type: str) -> Optional[Tuple]:
+        """
+        Get (rows_done, chunks_done, imported, skipped, status, rejected) for a
+        previous import of a file, where rejected is the sorted list of data
+        row indexes that failed validation
+        """
+        self.cursor.execute("""
+                            SELECT rows_done, chunks_done, imported, skipped, status, rejected
+                            FROM import_journal
+                            WHERE file_hash = ?
+                              AND import_type = ?
+                            """, (file_hash, import_type))
+        row = self.cursor.fetchone()
+        if row is None:
+            return None
+        return row[:5] + (json.loads(row[5]) if row[5] else [],)
+
+    def record_import_progress(self, file_hash: str, import_type: str, filename: str,
+                               rows_done: int, chunks_done: int, imported: int, skipped: int,
+                               status: str = 'running', rejected: Iterable[int] = ()):
+        """
+        Record how far an import has got
+        Call it inside the chunk's transaction so the journal and the rows
+        it describes commit together. status is 'running' until the whole
+        file has been read, then 'complete', or 'rejected' while rows listed
+        in rejected still wait for a rerun.
+        """
+        rejected = json.dumps(sorted(rejected)) if rejected else None
+        self.cursor.execute("""
+                            INSERT INTO import_journal (file_hash, import_type, filename, rows_done,
+                                                        chunks_done, imported, skipped, status, rejected)
+                            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                            ON CONFLICT (file_hash, import_type) DO UPDATE SET filename    = excluded.filename,
+                                                                               rows_done   = excluded.rows_done,
+                                                                               chunks_done = excluded.chunks_done,
+                                                                               imported    = excluded.imported,
+                                                                               skipped     = excluded.skipped,
+                                                                               status      = excluded.status,
+                                                                               rejected    = excluded.rejected,
+                                                                               updated_at  = CURRENT_TIMESTAMP
+                            """, (file_hash, import_type, filename, rows_done, chunks_done, imported, skipped,
+                                  status, rejected))
+        self._commit()
+
+    def clear_import_journal(self, file_hash: str = None):
+        """Forget previous imports of one file, or of every file, so they can be loaded again"""
+        if file_hash is None:
+            self.cursor.execute("DELETE FROM import_journal")
+        else:
+            self.cursor.execute("DELETE FROM import_journal WHERE file_hash = ?", (file_hash,))
+        self._commit()
+
     # ==================== CONFIGURATION OPERATIONS ====================
 
     def get_grading_config(self) -> List[Tuple]:
@@ -379,7 +1111,7 @@ class DBManager:
             "UPDATE grading_config SET weight = ? WHERE component = ?",
             (weight, component)
         )
-        self.conn.commit()
+        self._commit()
 
     def add_grading_component(self, component: str, weight: float):
         """Add a new grading component"""
@@ -388,7 +1120,7 @@ class DBManager:
                 "INSERT INTO grading_config (component, weight) VALUES (?, ?)",
                 (component, weight)
             )
-            self.conn.commit()
+            self._commit()
             return True
         except sqlite3.IntegrityError:
             # Component already exists
@@ -401,17 +1133,13 @@ class DBManager:
                 "DELETE FROM grading_config WHERE component = ?",
                 (component,)
             )
-            self.conn.commit()
+            self._commit()
             return True
         except Exception:
             return False
 
     def reset_grading_config(self):
         """Reset to default grading configuration"""
-        # Clear all existing components
-        self.cursor.execute("DELETE FROM grading_config")
-
-        # Insert default components
         default_config = [
             ('Attendance', 10.0),
             ('Quizzes', 20.0),
@@ -419,37 +1147,97 @@ class DBManager:
             ('Midterm', 20.0),
             ('Final Exam', 20.0)
         ]
-        self.cursor.executemany(
-            "INSERT INTO grading_config (component, weight) VALUES (?, ?)",
-            default_config
-        )
-        self.conn.commit()
+
+        with self.transaction():
+            # Clear all existing components
+            self.cursor.execute("DELETE FROM grading_config")
+
+            # Insert default components
+            self.cursor.executemany(
+                "INSERT INTO grading_config (component, weight) VALUES (?, ?)",
+                default_config
+            )
 
     # ==================== BACKUP & MAINTENANCE ====================
 
-    def backup_database(self) -> str:
-        """Create a backup of the database"""
+    def backup_database(self, compression: str = None, keep: int = None,
+                        pages: int = 1024, progress: Callable[[int, int], None] = None) -> str:
+        """
+        Create a backup of the database without closing the connection
+        Pages are copied in steps through the SQLite backup API, so the
+        database stays usable in between; progress(copied, total) is called
+        after each step. compression may be 'gzip' or 'lzma', and keep limits
+        how many backups are retained in the backups directory.
+
+        The copy reads through a connection of its own rather than self.conn,
+        so the whole backup, compression included, can run in a worker thread.
+        """
+        import gzip
+        import lzma
         import shutil
         from datetime import datetime
 
+        openers = {'gzip': ('.gz', gzip.open), 'lzma': ('.xz', lzma.open)}
+        if compression is not None and compression not in openers:
+            raise ValueError(f"Unknown backup compression: {compression}")
+
         backup_dir = os.path.join(os.path.dirname(self.db_path), 'backups')
         os.makedirs(backup_dir, exist_ok=True)
 
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         backup_path = os.path.join(backup_dir, f'attendance_backup_{timestamp}.db')
 
-        # Close connection temporarily
-        self.conn.close()
+        def report(status, remaining, total):
+            if progress:
+                progress(total - remaining, total)
 
-        # Copy database file
-        shutil.copy2(self.db_path, backup_path)
+        source = sqlite3.connect(self.db_path)
+        target = sqlite3.connect(backup_path)
+        try:
+            source.backup(target, pages=pages, progress=report)
+        finally:
+            target.close()
+            source.close()
 
-        # Reconnect
-        self.conn = sqlite3.connect(self.db_path)
-        self.cursor = self.conn.cursor()
+        if compression:
+            suffix, opener = openers[compression]
+            with open(backup_path, 'rb') as src, opener(backup_path + suffix, 'wb') as dst:
+                shutil.copyfileobj(src, dst, 1024 * 1024)
+            os.remove(backup_path)
+            backup_path += suffix
+
+        if keep is not None:
+            self.prune_backups(keep)
 
         return backup_path
 
+    def prune_backups(self, keep: int) -> List[str]:
+        """Delete all but the newest `keep` backups and return the removed paths"""
+        backup_dir = os.path.join(os.path.dirname(self.db_path), 'backups')
+        if not os.path.isdir(backup_dir):
+            return []
+
+        # Timestamped names sort chronologically
+        backups = sorted(
+            name for name in os.listdir(backup_dir)
+            if name.startswith('attendance_backup_')
+        )
+        removed = []
+        for name in backups[:max(len(backups) - keep, 0)]:
+            path = os.path.join(backup_dir, name)
+            os.remove(path)
+            removed.append(path)
+        return removed
+
+    def get_change_counter(self) -> Tuple[int, int]:
+        """
+        Get (data_version, total_changes) for this connection
+        data_version moves when another connection commits and total_changes
+        when this one writes, so the pair is unchanged only while the data is
+        """
+        self.cursor.execute("PRAGMA data_version")
+        return self.cursor.fetchone()[0], self.conn.total_changes
+
     def get_database_info(self) -> Dict[str, any]:
         """Get database information"""
         info = {}
@@ -473,7 +1261,13 @@ class DBManager:
     def close(self):
         """Close database connection"""
         if self.conn:
+            if self.read_only:
+                self.conn.rollback()
+            else:
+                # Let SQLite refresh planner statistics that have gone stale
+                self.conn.execute("PRAGMA optimize")
             self.conn.close()
+            self.conn = None
 
     def __del__(self):
         """Destructor - ensure connection is closed"""
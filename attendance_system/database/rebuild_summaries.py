@@ -0,0 +1,30 @@
+"""
+Utility script to rebuild the derived summary tables from the raw records.
+Use it to repair the summaries if they ever drift from the source tables.
+"""
+import os
+import sys
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from attendance_system.database.db_manager import DBManager
+
+
+def rebuild_summaries():
+    """Rebuild every summary table in the attendance database"""
+    db = DBManager()
+    try:
+        print("Rebuilding attendance summary...")
+        db.rebuild_attendance_summary()
+        print("Rebuilding grade aggregates...")
+        db.rebuild_grade_aggregates()
+        print("✅ Summary tables rebuilt successfully!")
+    except Exception as e:
+        print(f"❌ Error rebuilding summaries: {e}")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    rebuild_summaries()
@@ -1,16 +1,21 @@
 import sys
 import os
+import multiprocessing
 from pathlib import Path
 
 # Add the parent directory to the path so we can import from attendance_system package
 parent_dir = Path(__file__).parent.parent
 sys.path.insert(0, str(parent_dir))
 
-from attendance_system.ui.main_window import MainWindow
-from PyQt5.QtWidgets import QApplication
-
 
 if __name__ == "__main__":
+    # Exports run in spawned worker processes, which re-import this module;
+    # keep the GUI imports under the guard and let frozen builds dispatch
+    multiprocessing.freeze_support()
+    
+    from attendance_system.ui.main_window import MainWindow
+    from PyQt5.QtWidgets import QApplication
+    
     app = QApplication(sys.argv)
     window = MainWindow()
     window.show()
@@ -3,10 +3,13 @@ Entry point for Kivy version
 """
 import os
 import sys
+import multiprocessing
 
 # Add project root to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 if __name__ == '__main__':
+    # Exports run in spawned worker processes; frozen builds need this first
+    multiprocessing.freeze_support()
     from attendance_system.ui_kivy.main_app import StudentManagementApp
     StudentManagementApp().run()
\ No newline at end of file
@@ -3,12 +3,16 @@ Entry point for ttkbootstrap version of Student Management System
 """
 import sys
 import os
+import multiprocessing
 
 # Add project root to path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 # Import and run the application
 if __name__ == "__main__":
+    # Exports run in spawned worker processes; frozen builds need this first
+    multiprocessing.freeze_support()
+    
     from attendance_system.ui_tkinter.main_app import MainApplication
     
     app = MainApplication()
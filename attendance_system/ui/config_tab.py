@@ -126,8 +126,9 @@ class ConfigTab(QWidget):
             return
         
         try:
-            for component, weight in updates:
-                self.db.update_grading_config(component, weight)
+            with self.db.transaction():
+                for component, weight in updates:
+                    self.db.update_grading_config(component, weight)
             QMessageBox.information(self, "Success", "Grading configuration saved!")
         except Exception as e:
             QMessageBox.warning(self, "Error", str(e))
@@ -0,0 +1,59 @@
+from PyQt5.QtWidgets import QProgressDialog, QMessageBox
+from PyQt5.QtCore import Qt, QTimer
+from attendance_system.utils.exports import export_cache
+from attendance_system.utils.jobs import ExportJob, progress_text
+
+
+class ExportProgressDialog(QProgressDialog):
+    """Runs an ExportJob in a worker process and shows its progress"""
+    
+    POLL_INTERVAL_MS = 100
+    
+    def __init__(self, db, export_type, filename, parent=None):
+        super().__init__("Starting export...", "Cancel", 0, 0, parent)
+        self.job = ExportJob(db.db_path, export_type, filename,
+                             cache_key=export_cache.key(db, export_type))
+        self.setWindowTitle(f"Export {export_type}")
+        self.setWindowModality(Qt.WindowModal)
+        self.setMinimumDuration(0)
+        self.setMinimumWidth(420)
+        self.setAutoClose(False)
+        self.setAutoReset(False)
+        self.canceled.connect(self.cancel_export)
+        
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.poll)
+    
+    def start(self):
+        """Start the worker and poll it from the event loop"""
+        self.job.start()
+        self.timer.start(self.POLL_INTERVAL_MS)
+        self.show()
+    
+    def poll(self):
+        """Pick up progress from the worker process without blocking the UI"""
+        for event in self.job.poll():
+            if event[0] == 'progress':
+                rows_written, total_rows = event[1], event[2]
+                if total_rows:
+                    self.setMaximum(total_rows)
+                    self.setValue(min(rows_written, total_rows))
+                self.setLabelText(progress_text(rows_written, total_rows))
+            else:
+                self.export_finished(event[1])
+    
+    def cancel_export(self):
+        """Stop the worker; poll() reports the cancellation"""
+        self.job.cancel()
+    
+    def export_finished(self, result):
+        """Report the result of the export"""
+        self.timer.stop()
+        self.hide()
+        
+        parent = self.parentWidget()
+        if result['success']:
+            QMessageBox.information(parent, "Success", result['message'])
+        elif not self.job.cancelled:
+            QMessageBox.warning(parent, "Error", result['message'])
+        self.deleteLater()
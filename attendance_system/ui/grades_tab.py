@@ -5,7 +5,7 @@ from PyQt5.QtWidgets import (
     QLabel, QFileDialog
 )
 from attendance_system.database.db_manager import DBManager
-from attendance_system.utils.exports import export_grades
+from attendance_system.ui.export_progress import ExportProgressDialog
 
 
 class GradesTab(QWidget):
@@ -186,11 +186,7 @@ class GradesTab(QWidget):
             self, "Export Grades", "", "Excel Files (*.xlsx)"
         )
         if filename:
-            try:
-                export_grades(self.db, filename)
-                QMessageBox.information(self, "Success", "File exported successfully!")
-            except Exception as e:
-                QMessageBox.warning(self, "Error", f"Export failed: {str(e)}")
+            ExportProgressDialog(self.db, 'Grades', filename, self).start()
     
     def show_import_dialog(self):
         """Show import dialog"""
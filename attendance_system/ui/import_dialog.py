@@ -1,9 +1,25 @@
 import pandas as pd
 from PyQt5.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
-    QComboBox, QFileDialog, QTextEdit, QGroupBox, QMessageBox
+    QComboBox, QFileDialog, QTextEdit, QGroupBox, QMessageBox, QProgressBar, QCheckBox
 )
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, QThread, pyqtSignal
+from attendance_system.utils.jobs import ImportJob, progress_text
+
+
+class ImportWorker(QThread):
+    """Runs an ImportJob off the GUI thread"""
+    
+    progress = pyqtSignal(object, object)
+    result_ready = pyqtSignal(dict)
+    
+    def __init__(self, job, parent=None):
+        super().__init__(parent)
+        self.job = job
+    
+    def run(self):
+        result = self.job.run(progress=self.progress.emit)
+        self.result_ready.emit(result)
 
 
 class ImportDialog(QDialog):
@@ -12,7 +28,8 @@ class ImportDialog(QDialog):
     def __init__(self, importer, parent=None):
         super().__init__(parent)
         self.importer = importer
-        self.setWindowTitle("Import Data from Excel")
+        self.worker = None
+        self.setWindowTitle("Import Data")
         self.setModal(True)
         self.setMinimumWidth(650)
         self.setMinimumHeight(500)
@@ -26,7 +43,7 @@ class ImportDialog(QDialog):
         layout.setContentsMargins(24, 24, 24, 24)
         
         # Title
-        title = QLabel("Import Data from Excel")
+        title = QLabel("Import Data")
         title.setStyleSheet("""
             font-size: 20px; 
             font-weight: 700; 
@@ -35,7 +52,7 @@ class ImportDialog(QDialog):
         """)
         layout.addWidget(title)
         
-        subtitle = QLabel("Select import type and choose your Excel file")
+        subtitle = QLabel("Select import type and choose an Excel or CSV file")
         subtitle.setStyleSheet("color: #64748b; font-size: 14px; margin-bottom: 12px;")
         layout.addWidget(subtitle)
         
@@ -45,7 +62,7 @@ class ImportDialog(QDialog):
         type_layout.setSpacing(12)
         
         self.import_type = QComboBox()
-        self.import_type.addItems(["Students", "Grades", "Attendance"])
+        self.import_type.addItems(["Students", "Students (Sync)", "Grades", "Attendance"])
         self.import_type.currentTextChanged.connect(self.update_format_info)
         
         type_layout.addWidget(QLabel("What would you like to import?"))
@@ -54,7 +71,7 @@ class ImportDialog(QDialog):
         layout.addWidget(type_group)
         
         # Format information
-        format_group = QGroupBox("Required Excel Format")
+        format_group = QGroupBox("Required Columns")
         format_layout = QVBoxLayout()
         
         self.format_info = QTextEdit()
@@ -90,29 +107,44 @@ class ImportDialog(QDialog):
         file_layout.addWidget(browse_btn)
         layout.addLayout(file_layout)
         
+        # Grades and attendance files are journaled; this loads one again in full
+        self.reimport_check = QCheckBox("Re-import files that were already imported")
+        self.reimport_check.setStyleSheet("color: #64748b;")
+        layout.addWidget(self.reimport_check)
+        
         # Download template button
         template_btn = QPushButton("Download Template")
         template_btn.setObjectName("secondaryButton")
         template_btn.clicked.connect(self.download_template)
         layout.addWidget(template_btn)
         
+        # Progress, shown while an import runs
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setVisible(False)
+        layout.addWidget(self.progress_bar)
+        
+        self.progress_label = QLabel("")
+        self.progress_label.setStyleSheet("color: #64748b;")
+        self.progress_label.setVisible(False)
+        layout.addWidget(self.progress_label)
+        
         # Action buttons
         button_layout = QHBoxLayout()
         button_layout.setSpacing(12)
         button_layout.addStretch()
         
-        import_btn = QPushButton("Import Data")
-        import_btn.setObjectName("primaryButton")
-        import_btn.setMinimumWidth(120)
-        import_btn.clicked.connect(self.import_data)
+        self.import_btn = QPushButton("Import Data")
+        self.import_btn.setObjectName("primaryButton")
+        self.import_btn.setMinimumWidth(120)
+        self.import_btn.clicked.connect(self.import_data)
         
-        cancel_btn = QPushButton("Cancel")
-        cancel_btn.setObjectName("secondaryButton")
-        cancel_btn.setMinimumWidth(120)
-        cancel_btn.clicked.connect(self.reject)
+        self.cancel_btn = QPushButton("Cancel")
+        self.cancel_btn.setObjectName("secondaryButton")
+        self.cancel_btn.setMinimumWidth(120)
+        self.cancel_btn.clicked.connect(self.reject)
         
-        button_layout.addWidget(import_btn)
-        button_layout.addWidget(cancel_btn)
+        button_layout.addWidget(self.import_btn)
+        button_layout.addWidget(self.cancel_btn)
         layout.addLayout(button_layout)
         
         self.setLayout(layout)
@@ -130,6 +162,16 @@ class ImportDialog(QDialog):
 
 <b>Example:</b><br>
 2021001 | John Doe | BSCS | john@email.com"""
+        elif import_type == "Students (Sync)":
+            info = """<b>Required Columns:</b><br>
+• Student ID (required)<br>
+• Name (required)<br>
+• Course (optional)<br>
+• Email (optional)<br><br>
+
+Makes the roster match the file: new students are added, changed
+details are updated, and students missing from the file are marked
+inactive. Their attendance and grades are kept."""
         elif import_type == "Grades":
             info = """<b>Required Columns:</b><br>
 • Student ID (required)<br>
@@ -152,15 +194,20 @@ class ImportDialog(QDialog):
         self.format_info.setHtml(info)
     
     def browse_file(self):
-        """Browse for Excel file"""
-        filename, _ = QFileDialog.getOpenFileName(
-            self, "Select Excel File", "", "Excel Files (*.xlsx *.xls)"
+        """Browse for Excel or CSV files; grades and attendance accept several"""
+        filenames, _ = QFileDialog.getOpenFileNames(
+            self, "Select Import Files", "",
+            "Spreadsheets (*.xlsx *.xls *.csv *.tsv);;Excel Files (*.xlsx *.xls);;CSV Files (*.csv *.tsv *.txt)"
         )
         
-        if filename:
-            self.selected_file = filename
+        if filenames:
             import os
-            self.file_label.setText(os.path.basename(filename))
+            if len(filenames) == 1:
+                self.selected_file = filenames[0]
+                self.file_label.setText(os.path.basename(filenames[0]))
+            else:
+                self.selected_file = filenames
+                self.file_label.setText(f"{len(filenames)} files")
             self.file_label.setStyleSheet("color: #059669; font-weight: 600;")
     
     def download_template(self):
@@ -168,13 +215,13 @@ class ImportDialog(QDialog):
         import_type = self.import_type.currentText()
         
         filename, _ = QFileDialog.getSaveFileName(
-            self, "Save Template", f"{import_type.lower()}_template.xlsx",
+            self, "Save Template", f"{import_type.split()[0].lower()}_template.xlsx",
             "Excel Files (*.xlsx)"
         )
         
         if filename:
             try:
-                if import_type == "Students":
+                if import_type.startswith("Students"):
                     df = pd.DataFrame({
                         'Student ID': ['2021001', '2021002', '2021003'],
                         'Name': ['John Doe', 'Jane Smith', 'Bob Johnson'],
@@ -202,24 +249,64 @@ class ImportDialog(QDialog):
                 QMessageBox.warning(self, "Error", f"Failed to download template: {str(e)}")
     
     def import_data(self):
-        """Perform import"""
+        """Start the import on a background worker"""
         if not hasattr(self, 'selected_file'):
             QMessageBox.warning(self, "Error", "Please select a file first!")
             return
         
-        import_type = self.import_type.currentText()
+        if isinstance(self.selected_file, list) and self.import_type.currentText().startswith("Students"):
+            QMessageBox.warning(self, "Error", "Students are imported from a single file!")
+            return
         
-        try:
-            if import_type == "Students":
-                result = self.importer.import_students(self.selected_file)
-            elif import_type == "Grades":
-                result = self.importer.import_grades(self.selected_file)
-            else:
-                result = self.importer.import_attendance(self.selected_file)
-            
-            self.importer.show_import_result(result, self)
-            
-            if result['success']:
-                self.accept()
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Import failed: {str(e)}")
\ No newline at end of file
+        job = ImportJob(
+            self.importer.db.db_path, self.import_type.currentText(),
+            self.selected_file, self.importer.chunk_size,
+            reimport=self.reimport_check.isChecked()
+        )
+        
+        self.worker = ImportWorker(job, self)
+        self.worker.progress.connect(self.update_progress)
+        self.worker.result_ready.connect(self.import_finished)
+        
+        self.import_btn.setEnabled(False)
+        self.import_type.setEnabled(False)
+        self.reimport_check.setEnabled(False)
+        self.progress_bar.setRange(0, 0)
+        self.progress_bar.setVisible(True)
+        self.progress_label.setText("Starting import...")
+        self.progress_label.setVisible(True)
+        
+        self.worker.start()
+    
+    def update_progress(self, rows_read, total_rows):
+        """Show progress reported after each committed chunk"""
+        if total_rows:
+            self.progress_bar.setRange(0, total_rows)
+            self.progress_bar.setValue(min(rows_read, total_rows))
+        self.progress_label.setText(progress_text(rows_read, total_rows, self.worker.job.unit))
+    
+    def import_finished(self, result):
+        """Show the result once the worker is done"""
+        self.worker.wait()
+        self.worker = None
+        
+        self.progress_bar.setVisible(False)
+        self.progress_label.setVisible(False)
+        self.import_btn.setEnabled(True)
+        self.import_type.setEnabled(True)
+        self.reimport_check.setEnabled(True)
+        
+        self.importer.show_import_result(result, self)
+        
+        # A failed import may still have committed earlier chunks
+        if result['success'] or result['imported']:
+            self.accept()
+    
+    def reject(self):
+        """Cancel a running import, or close the dialog"""
+        if self.worker is not None:
+            self.worker.job.cancel()
+            self.progress_label.setText("Cancelling...")
+            return
+        
+        super().reject()
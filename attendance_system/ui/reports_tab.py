@@ -1,11 +1,11 @@
 from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QTableWidget, QTableWidgetItem,
-    QPushButton, QLabel, QMessageBox, QFileDialog
+    QPushButton, QLabel, QFileDialog
 )
 from PyQt5.QtGui import QColor
 from attendance_system.database.db_manager import DBManager
 from attendance_system.utils.calculations import generate_report
-from attendance_system.utils.exports import export_report
+from attendance_system.ui.export_progress import ExportProgressDialog
 
 
 class ReportsTab(QWidget):
@@ -75,8 +75,18 @@ class ReportsTab(QWidget):
         export_report_btn.setObjectName("secondaryButton")
         export_report_btn.clicked.connect(self.export_to_excel)
         
+        export_term_btn = QPushButton("Export Term Package")
+        export_term_btn.setObjectName("secondaryButton")
+        export_term_btn.clicked.connect(self.export_term_package)
+        
         btn_layout.addWidget(refresh_report_btn)
         btn_layout.addWidget(export_report_btn)
+        btn_layout.addWidget(export_term_btn)
+        
+        export_matrix_btn = QPushButton("Export Attendance Matrix")
+        export_matrix_btn.setObjectName("secondaryButton")
+        export_matrix_btn.clicked.connect(self.export_attendance_matrix)
+        btn_layout.addWidget(export_matrix_btn)
         btn_layout.addStretch()
         layout.addLayout(btn_layout)
         
@@ -159,8 +169,20 @@ class ReportsTab(QWidget):
             self, "Export Report", "", "Excel Files (*.xlsx)"
         )
         if filename:
-            try:
-                export_report(self.db, filename)
-                QMessageBox.information(self, "Success", "Report exported successfully!")
-            except Exception as e:
-                QMessageBox.warning(self, "Error", f"Export failed: {str(e)}")
\ No newline at end of file
+            ExportProgressDialog(self.db, 'Report', filename, self).start()
+    
+    def export_term_package(self):
+        """Export students, grades, attendance and final grades as one workbook"""
+        filename, _ = QFileDialog.getSaveFileName(
+            self, "Export Term Package", "term_package.xlsx", "Excel Files (*.xlsx)"
+        )
+        if filename:
+            ExportProgressDialog(self.db, 'Term Package', filename, self).start()
+    
+    def export_attendance_matrix(self):
+        """Export attendance as a students x dates grid"""
+        filename, _ = QFileDialog.getSaveFileName(
+            self, "Export Attendance Matrix", "attendance_matrix.xlsx", "Excel Files (*.xlsx)"
+        )
+        if filename:
+            ExportProgressDialog(self.db, 'Attendance Matrix', filename, self).start()
\ No newline at end of file
@@ -6,7 +6,7 @@ from PyQt5.QtWidgets import (
 )
 from PyQt5.QtCore import Qt
 from attendance_system.database.db_manager import DBManager
-from attendance_system.utils.exports import export_students
+from attendance_system.ui.export_progress import ExportProgressDialog
 
 
 class StudentTab(QWidget):
@@ -198,9 +198,11 @@ class StudentTab(QWidget):
         
         def save_attendance():
             today = datetime.now().strftime("%Y-%m-%d")
-            for student_id, cb in checkboxes.items():
-                status = "Present" if cb.isChecked() else "Absent"
-                self.db.mark_attendance(student_id, today, status)
+            statuses = {
+                student_id: "Present" if cb.isChecked() else "Absent"
+                for student_id, cb in checkboxes.items()
+            }
+            self.db.mark_attendance_bulk(today, statuses)
             QMessageBox.information(self, "Success", "Attendance saved successfully!")
             dialog.close()
             self.refresh_students()
@@ -228,11 +230,7 @@ class StudentTab(QWidget):
             self, "Export Students", "", "Excel Files (*.xlsx)"
         )
         if filename:
-            try:
-                export_students(self.db, filename)
-                QMessageBox.information(self, "Success", "File exported successfully!")
-            except Exception as e:
-                QMessageBox.warning(self, "Error", f"Export failed: {str(e)}")
+            ExportProgressDialog(self.db, 'Students', filename, self).start()
     
     def show_import_dialog(self):
         """Show import dialog"""
@@ -273,8 +273,9 @@ class ConfigScreen(BoxLayout):
         
         # Save to database
         try:
-            for component, weight in updates:
-                self.db.update_grading_config(component, weight)
+            with self.db.transaction():
+                for component, weight in updates:
+                    self.db.update_grading_config(component, weight)
             self.show_popup('Success', 'Grading configuration saved successfully!')
         except Exception as e:
             self.show_popup('Error', f'Failed to save configuration: {str(e)}')
@@ -0,0 +1,92 @@
+"""
+Export progress popup - Kivy Version
+Runs an Excel export in a worker process and reports back in place
+"""
+from kivy.uix.boxlayout import BoxLayout
+from kivy.uix.label import Label
+from kivy.uix.button import Button
+from kivy.uix.popup import Popup
+from kivy.uix.progressbar import ProgressBar
+from kivy.clock import Clock
+from kivy.metrics import dp
+from attendance_system.utils.exports import export_cache
+from attendance_system.utils.jobs import ExportJob, progress_text
+
+
+class ExportPopup(Popup):
+    """Popup tracking one ExportJob, polled with Clock"""
+
+    POLL_INTERVAL = 0.1
+
+    def __init__(self, db, export_type, filename, **kwargs):
+        self.job = ExportJob(db.db_path, export_type, filename,
+                             cache_key=export_cache.key(db, export_type))
+        self._poll_event = None
+
+        content = BoxLayout(orientation='vertical', padding=dp(28), spacing=dp(16))
+
+        self.progress = ProgressBar(max=1, value=0, size_hint_y=None, height=dp(24))
+        content.add_widget(self.progress)
+
+        self.status = Label(
+            text='Starting export...',
+            font_size='15sp',
+            color=(0.28, 0.34, 0.41, 1)
+        )
+        content.add_widget(self.status)
+
+        self.action_btn = Button(
+            text='Cancel',
+            size_hint_y=None,
+            height=dp(48),
+            background_color=(0.5, 0.5, 0.5, 1),
+            color=(1, 1, 1, 1),
+            font_size='16sp'
+        )
+        self.action_btn.bind(on_press=self.on_action)
+        content.add_widget(self.action_btn)
+
+        super().__init__(
+            title=f'Export {export_type}',
+            content=content,
+            size_hint=(0.5, 0.4),
+            title_size='18sp',
+            auto_dismiss=False,
+            **kwargs
+        )
+
+    def start(self):
+        """Start the worker and open the popup"""
+        self.job.start()
+        self._poll_event = Clock.schedule_interval(self.poll, self.POLL_INTERVAL)
+        self.open()
+
+    def poll(self, dt):
+        """Pick up progress from the worker process without blocking the UI"""
+        for event in self.job.poll():
+            if event[0] == 'progress':
+                rows_written, total_rows = event[1], event[2]
+                if total_rows:
+                    self.progress.max = total_rows
+                    self.progress.value = min(rows_written, total_rows)
+                self.status.text = progress_text(rows_written, total_rows)
+            else:
+                self.export_finished(event[1])
+                return False
+
+    def export_finished(self, result):
+        """Show the result in place of the progress"""
+        self._poll_event.cancel()
+        self._poll_event = None
+        if result['success']:
+            self.progress.value = self.progress.max
+        self.status.text = 'Export cancelled' if self.job.cancelled else result['message']
+        self.action_btn.text = 'OK'
+        self.action_btn.background_color = (0.15, 0.44, 0.92, 1)
+
+    def on_action(self, instance):
+        if self._poll_event is not None:
+            self.job.cancel()
+            self.status.text = 'Cancelling...'
+        else:
+            self.dismiss()
@@ -410,13 +410,8 @@ class GradesScreen(BoxLayout):
 
     def export_grades(self, instance):
         """Export grades to Excel"""
-        try:
-            from attendance_system.utils.exports import export_grades
-            filename = 'grades_export.xlsx'
-            export_grades(self.db, filename)
-            self.show_popup('Success', f'Exported to {filename}')
-        except Exception as e:
-            self.show_popup('Error', f'Export failed: {str(e)}')
+        from attendance_system.ui_kivy.export_progress import ExportPopup
+        ExportPopup(self.db, 'Grades', 'grades_export.xlsx').start()
 
     def show_popup(self, title, message):
         """Show modern popup message"""
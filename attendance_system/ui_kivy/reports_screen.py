@@ -196,6 +196,28 @@ class ReportsScreen(BoxLayout):
         export_btn.bind(on_press=self.export_report)
         btn_layout.add_widget(export_btn)
         
+        # Export Term Package
+        export_term_btn = Button(
+            text='Export Term Package',
+            size_hint_x=None,
+            width=200,
+            background_color=(0.94, 0.96, 0.98, 1),
+            color=(0.28, 0.34, 0.41, 1)
+        )
+        export_term_btn.bind(on_press=self.export_term_package)
+        btn_layout.add_widget(export_term_btn)
+        
+        # Export Attendance Matrix
+        export_matrix_btn = Button(
+            text='Export Attendance Matrix',
+            size_hint_x=None,
+            width=220,
+            background_color=(0.94, 0.96, 0.98, 1),
+            color=(0.28, 0.34, 0.41, 1)
+        )
+        export_matrix_btn.bind(on_press=self.export_attendance_matrix)
+        btn_layout.add_widget(export_matrix_btn)
+        
         # Spacer
         btn_layout.add_widget(BoxLayout())
         
@@ -268,13 +290,18 @@ class ReportsScreen(BoxLayout):
     
     def export_report(self, instance):
         """Export report to Excel"""
-        try:
-            from attendance_system.utils.exports import export_report
-            filename = 'final_report.xlsx'
-            export_report(self.db, filename)
-            self.show_popup('Success', f'Report exported to {filename}')
-        except Exception as e:
-            self.show_popup('Error', f'Export failed: {str(e)}')
+        from attendance_system.ui_kivy.export_progress import ExportPopup
+        ExportPopup(self.db, 'Report', 'final_report.xlsx').start()
+    
+    def export_term_package(self, instance):
+        """Export students, grades, attendance and final grades as one workbook"""
+        from attendance_system.ui_kivy.export_progress import ExportPopup
+        ExportPopup(self.db, 'Term Package', 'term_package.xlsx').start()
+    
+    def export_attendance_matrix(self, instance):
+        """Export attendance as a students x dates grid"""
+        from attendance_system.ui_kivy.export_progress import ExportPopup
+        ExportPopup(self.db, 'Attendance Matrix', 'attendance_matrix.xlsx').start()
     
     def show_popup(self, title, message):
         """Show popup message"""
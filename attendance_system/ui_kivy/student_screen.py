@@ -10,6 +10,8 @@ from kivy.uix.button import Button
 from kivy.uix.textinput import TextInput
 from kivy.uix.popup import Popup
 from kivy.uix.checkbox import CheckBox
+from kivy.uix.progressbar import ProgressBar
+from kivy.clock import Clock
 from kivy.graphics import Color, RoundedRectangle
 from kivy.metrics import dp
 from datetime import datetime
@@ -334,6 +336,18 @@ class StudentScreen(BoxLayout):
         export_btn.bind(on_press=self.export_students)
         btn_layout.add_widget(export_btn)
 
+        # Import
+        import_btn = Button(
+            text='Import Students',
+            size_hint_x=None,
+            width=dp(160),
+            background_color=(0.94, 0.96, 0.98, 1),
+            color=(0.28, 0.34, 0.41, 1),
+            font_size='15sp'
+        )
+        import_btn.bind(on_press=self.import_students)
+        btn_layout.add_widget(import_btn)
+
         self.add_widget(btn_layout)
 
     def add_student(self, instance):
@@ -480,9 +494,11 @@ class StudentScreen(BoxLayout):
 
         def save_attendance(instance):
             today = datetime.now().strftime("%Y-%m-%d")
-            for student_id, cb in checkboxes.items():
-                status = "Present" if cb.active else "Absent"
-                self.db.mark_attendance(student_id, today, status)
+            statuses = {
+                student_id: "Present" if cb.active else "Absent"
+                for student_id, cb in checkboxes.items()
+            }
+            self.db.mark_attendance_bulk(today, statuses)
             popup.dismiss()
             self.show_popup('Success', 'Attendance saved successfully!')
             self.refresh_students()
@@ -519,13 +535,110 @@ class StudentScreen(BoxLayout):
 
     def export_students(self, instance):
         """Export students to Excel"""
-        try:
-            from attendance_system.utils.exports import export_students
-            filename = 'students_export.xlsx'
-            export_students(self.db, filename)
-            self.show_popup('Success', f'Exported to {filename}')
-        except Exception as e:
-            self.show_popup('Error', f'Export failed: {str(e)}')
+        from attendance_system.ui_kivy.export_progress import ExportPopup
+        ExportPopup(self.db, 'Students', 'students_export.xlsx').start()
+
+    def import_students(self, instance):
+        """Import students from an Excel or CSV file on a background thread"""
+        from attendance_system.utils.jobs import ImportJob, progress_text
+
+        content = BoxLayout(orientation='vertical', padding=dp(28), spacing=dp(16))
+
+        path_input = TextInput(
+            hint_text='Path to .xlsx or .csv file',
+            multiline=False,
+            size_hint_y=None,
+            height=dp(44),
+            font_size='15sp'
+        )
+        content.add_widget(path_input)
+
+        progress = ProgressBar(max=1, value=0, size_hint_y=None, height=dp(24))
+        content.add_widget(progress)
+
+        status = Label(
+            text='',
+            size_hint_y=None,
+            height=dp(28),
+            font_size='14sp',
+            color=(0.5, 0.55, 0.6, 1)
+        )
+        content.add_widget(status)
+
+        btn_layout = BoxLayout(size_hint_y=None, height=dp(56), spacing=dp(12))
+
+        start_btn = Button(
+            text='Import',
+            background_color=(0.02, 0.71, 0.41, 1),
+            color=(1, 1, 1, 1),
+            font_size='16sp',
+            bold=True
+        )
+        cancel_btn = Button(
+            text='Cancel',
+            background_color=(0.5, 0.5, 0.5, 1),
+            color=(1, 1, 1, 1),
+            font_size='16sp'
+        )
+        btn_layout.add_widget(start_btn)
+        btn_layout.add_widget(cancel_btn)
+        content.add_widget(btn_layout)
+
+        popup = Popup(
+            title='Import Students',
+            content=content,
+            size_hint=(0.6, 0.5),
+            title_size='18sp',
+            auto_dismiss=False
+        )
+        state = {'job': None}
+
+        def poll(dt):
+            for event in state['job'].poll():
+                if event[0] == 'progress':
+                    rows_read, total_rows = event[1], event[2]
+                    if total_rows:
+                        progress.max = total_rows
+                        progress.value = min(rows_read, total_rows)
+                    status.text = progress_text(rows_read, total_rows)
+                else:
+                    finished(event[1])
+                    return False
+
+        def finished(result):
+            state['job'] = None
+            popup.dismiss()
+            if result['success']:
+                self.show_popup(
+                    'Success',
+                    f"Imported {result['imported']} students\nSkipped {result['skipped']} rows"
+                )
+            else:
+                self.show_popup('Error', result['message'])
+            if result['imported']:
+                self.refresh_students()
+
+        def start(instance):
+            filename = path_input.text.strip()
+            if not filename or state['job'] is not None:
+                return
+            state['job'] = ImportJob(self.db.db_path, 'Students', filename)
+            state['job'].start()
+            start_btn.disabled = True
+            path_input.disabled = True
+            status.text = 'Starting import...'
+            Clock.schedule_interval(poll, 0.1)
+
+        def cancel(instance):
+            if state['job'] is not None:
+                state['job'].cancel()
+                status.text = 'Cancelling...'
+            else:
+                popup.dismiss()
+
+        start_btn.bind(on_press=start)
+        cancel_btn.bind(on_press=cancel)
+        popup.open()
 
     def show_popup(self, title, message):
         """Show modern popup message"""
@@ -340,8 +340,9 @@ class ConfigTab(ttk.Frame):
             return
 
         try:
-            for component, weight in updates:
-                self.db.update_grading_config(component, weight)
+            with self.db.transaction():
+                for component, weight in updates:
+                    self.db.update_grading_config(component, weight)
             messagebox.showinfo("Success", "Grading configuration saved successfully!")
         except Exception as e:
             messagebox.showerror("Error", str(e))
@@ -451,7 +452,25 @@ class ReportsTab(ttk.Frame):
             bootstyle="info-outline",
             width=18
         )
-        export_btn.pack(side=LEFT)
+        export_btn.pack(side=LEFT, padx=(0, 10))
+        
+        export_term_btn = ttk.Button(
+            btn_frame,
+            text="Export Term Package",
+            command=self.export_term_package,
+            bootstyle="info-outline",
+            width=22
+        )
+        export_term_btn.pack(side=LEFT, padx=(0, 10))
+        
+        export_matrix_btn = ttk.Button(
+            btn_frame,
+            text="Export Attendance Matrix",
+            command=self.export_attendance_matrix,
+            bootstyle="info-outline",
+            width=24
+        )
+        export_matrix_btn.pack(side=LEFT)
     
     def generate_report(self):
         """Generate comprehensive report"""
@@ -521,9 +540,27 @@ class ReportsTab(ttk.Frame):
             filetypes=[("Excel Files", "*.xlsx")]
         )
         if filename:
-            try:
-                from attendance_system.utils.exports import export_report
-                export_report(self.db, filename)
-                messagebox.showinfo("Success", "Report exported successfully!")
-            except Exception as e:
-                messagebox.showerror("Error", f"Export failed: {str(e)}")
\ No newline at end of file
+            from attendance_system.ui_tkinter.export_progress import ExportProgressWindow
+            ExportProgressWindow(self, self.db, 'Report', filename).start()
+    
+    def export_term_package(self):
+        """Export students, grades, attendance and final grades as one workbook"""
+        filename = filedialog.asksaveasfilename(
+            defaultextension=".xlsx",
+            initialfile="term_package.xlsx",
+            filetypes=[("Excel Files", "*.xlsx")]
+        )
+        if filename:
+            from attendance_system.ui_tkinter.export_progress import ExportProgressWindow
+            ExportProgressWindow(self, self.db, 'Term Package', filename).start()
+    
+    def export_attendance_matrix(self):
+        """Export attendance as a students x dates grid"""
+        filename = filedialog.asksaveasfilename(
+            defaultextension=".xlsx",
+            initialfile="attendance_matrix.xlsx",
+            filetypes=[("Excel Files", "*.xlsx")]
+        )
+        if filename:
+            from attendance_system.ui_tkinter.export_progress import ExportProgressWindow
+            ExportProgressWindow(self, self.db, 'Attendance Matrix', filename).start()
\ No newline at end of file
@@ -0,0 +1,79 @@
+"""
+Export progress window - runs an Excel export in a worker process
+"""
+import ttkbootstrap as ttk
+from ttkbootstrap.constants import *
+from tkinter import messagebox
+from attendance_system.utils.exports import export_cache
+from attendance_system.utils.jobs import ExportJob, progress_text
+
+
+class ExportProgressWindow(ttk.Toplevel):
+    """Small window tracking one ExportJob, polled with after()"""
+    
+    POLL_INTERVAL_MS = 100
+    
+    def __init__(self, parent, db, export_type, filename):
+        super().__init__(parent)
+        self.job = ExportJob(db.db_path, export_type, filename,
+                             cache_key=export_cache.key(db, export_type))
+        self.title(f"Export {export_type}")
+        self.geometry("420x150")
+        self.resizable(False, False)
+        self.protocol("WM_DELETE_WINDOW", self.cancel_export)
+        
+        frame = ttk.Frame(self, padding=20)
+        frame.pack(fill=BOTH, expand=YES)
+        
+        self.status = ttk.Label(frame, text="Starting export...", bootstyle="secondary")
+        self.status.pack(fill=X, pady=(0, 10))
+        
+        self.progress = ttk.Progressbar(frame, mode="indeterminate", bootstyle="info")
+        self.progress.pack(fill=X, pady=(0, 15))
+        
+        self.cancel_btn = ttk.Button(
+            frame,
+            text="Cancel",
+            command=self.cancel_export,
+            bootstyle="secondary-outline",
+            width=15
+        )
+        self.cancel_btn.pack(side=RIGHT)
+    
+    def start(self):
+        """Start the worker and poll it from the Tk event loop"""
+        self.job.start()
+        self.progress.start()
+        self.after(self.POLL_INTERVAL_MS, self.poll)
+    
+    def poll(self):
+        """Pick up progress from the worker process without blocking the UI"""
+        for event in self.job.poll():
+            if event[0] == 'progress':
+                rows_written, total_rows = event[1], event[2]
+                if total_rows:
+                    self.progress.stop()
+                    self.progress.config(mode="determinate", maximum=total_rows,
+                                         value=min(rows_written, total_rows))
+                self.status.config(text=progress_text(rows_written, total_rows))
+            else:
+                self.export_finished(event[1])
+                return
+        
+        self.after(self.POLL_INTERVAL_MS, self.poll)
+    
+    def cancel_export(self):
+        """Stop the worker; poll() reports the cancellation"""
+        self.job.cancel()
+        self.status.config(text="Cancelling...")
+        self.cancel_btn.config(state=DISABLED)
+    
+    def export_finished(self, result):
+        """Report the result of the export"""
+        parent = self.master
+        self.destroy()
+        
+        if result['success']:
+            messagebox.showinfo("Success", result['message'], parent=parent)
+        elif not self.job.cancelled:
+            messagebox.showerror("Error", result['message'], parent=parent)
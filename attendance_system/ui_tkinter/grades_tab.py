@@ -18,6 +18,8 @@ class GradesTab(ttk.Frame):
         self.db = db
         self.calculate_callback = calculate_callback
 
+        self.import_job = None
+
         self.create_widgets()
         self.refresh_grades()
 
@@ -205,14 +207,28 @@ class GradesTab(ttk.Frame):
         )
         export_btn.pack(side=LEFT, padx=(0, 10))
 
-        import_btn = ttk.Button(
+        self.import_btn = ttk.Button(
             right_frame,
             text="Import from Excel",
             command=self.import_grades,
             bootstyle="info-outline",
             width=18
         )
-        import_btn.pack(side=LEFT)
+        self.import_btn.pack(side=LEFT)
+
+        # Grade files are journaled; this loads one again in full
+        self.reimport_var = ttk.BooleanVar(value=False)
+        reimport_check = ttk.Checkbutton(
+            btn_frame,
+            text="Re-import files already imported",
+            variable=self.reimport_var,
+            bootstyle="secondary"
+        )
+        reimport_check.pack(side=RIGHT, padx=(0, 10))
+
+        # Progress of a running import
+        self.import_status = ttk.Label(btn_frame, text="", bootstyle="secondary")
+        self.import_status.pack(side=RIGHT, padx=(0, 10))
 
     def on_row_select(self, event):
         """Handle row selection - auto-fill Student ID"""
@@ -326,32 +342,62 @@ class GradesTab(ttk.Frame):
             filetypes=[("Excel Files", "*.xlsx")]
         )
         if filename:
-            try:
-                from attendance_system.utils.exports import export_grades
-                export_grades(self.db, filename)
-                messagebox.showinfo("Success", "Grades exported successfully!")
-            except Exception as e:
-                messagebox.showerror("Error", f"Export failed: {str(e)}")
+            from attendance_system.ui_tkinter.export_progress import ExportProgressWindow
+            ExportProgressWindow(self, self.db, 'Grades', filename).start()
     
     def import_grades(self):
-        """Import grades from Excel"""
-        filename = filedialog.askopenfilename(
-            filetypes=[("Excel Files", "*.xlsx *.xls")]
+        """Import one or more grade files from Excel or CSV on a background thread"""
+        if self.import_job is not None:
+            self.import_job.cancel()
+            self.import_status.config(text="Cancelling...")
+            return
+
+        filenames = filedialog.askopenfilenames(
+            filetypes=[
+                ("Spreadsheets", "*.xlsx *.xls *.csv *.tsv"),
+                ("Excel Files", "*.xlsx *.xls"),
+                ("CSV Files", "*.csv *.tsv *.txt")
+            ]
         )
-        if filename:
-            try:
-                from attendance_system.utils.imports import ExcelImporter
-                importer = ExcelImporter(self.db)
-                result = importer.import_grades(filename)
-                
-                if result['success']:
-                    messagebox.showinfo(
-                        "Success",
-                        f"Imported {result['imported']} grades successfully!\n"
-                        f"Skipped {result['skipped']} records."
-                    )
-                    self.refresh_grades()
-                else:
-                    messagebox.showerror("Error", result.get('error', 'Import failed'))
-            except Exception as e:
-                messagebox.showerror("Error", f"Import failed: {str(e)}")
\ No newline at end of file
+        if filenames:
+            from attendance_system.utils.jobs import ImportJob
+            # Several files are parsed in parallel by a batch import
+            filename = filenames[0] if len(filenames) == 1 else list(filenames)
+            self.import_job = ImportJob(self.db.db_path, 'Grades', filename,
+                                        reimport=self.reimport_var.get())
+            self.import_job.start()
+
+            self.import_btn.config(text="Cancel Import", bootstyle="danger-outline")
+            self.import_status.config(text="Starting import...")
+            self.after(100, self.poll_import)
+
+    def poll_import(self):
+        """Pick up progress from the import thread without blocking the UI"""
+        from attendance_system.utils.jobs import progress_text
+
+        for event in self.import_job.poll():
+            if event[0] == 'progress':
+                self.import_status.config(text=progress_text(event[1], event[2], self.import_job.unit))
+            else:
+                self.import_finished(event[1])
+                return
+
+        self.after(100, self.poll_import)
+
+    def import_finished(self, result):
+        """Report the result of a background import"""
+        self.import_job = None
+        self.import_btn.config(text="Import from Excel", bootstyle="info-outline")
+        self.import_status.config(text="")
+
+        if result['success']:
+            messagebox.showinfo(
+                "Success",
+                f"Imported {result['imported']} grades successfully!\n"
+                f"Skipped {result['skipped']} records."
+            )
+        else:
+            messagebox.showerror("Error", result['message'])
+
+        if result['imported']:
+            self.refresh_grades()
@@ -16,6 +16,8 @@ class StudentTab(ttk.Frame):
         super().__init__(parent)
         self.db = db
         
+        self.import_job = None
+        
         self.create_widgets()
         self.refresh_students()
     
@@ -165,14 +167,18 @@ class StudentTab(ttk.Frame):
         )
         export_btn.pack(side=LEFT, padx=(0, 10))
         
-        import_btn = ttk.Button(
+        self.import_btn = ttk.Button(
             right_frame,
             text="Import from Excel",
             command=self.import_students,
             bootstyle="info-outline",
             width=18
         )
-        import_btn.pack(side=LEFT)
+        self.import_btn.pack(side=LEFT)
+        
+        # Progress of a running import
+        self.import_status = ttk.Label(btn_frame, text="", bootstyle="secondary")
+        self.import_status.pack(side=RIGHT, padx=(0, 10))
     
     def add_student(self):
         """Add a new student"""
@@ -278,9 +284,11 @@ class StudentTab(ttk.Frame):
         
         def save_attendance():
             today = datetime.now().strftime("%Y-%m-%d")
-            for student_id, var in checkboxes.items():
-                status = "Present" if var.get() else "Absent"
-                self.db.mark_attendance(student_id, today, status)
+            statuses = {
+                student_id: "Present" if var.get() else "Absent"
+                for student_id, var in checkboxes.items()
+            }
+            self.db.mark_attendance_bulk(today, statuses)
             messagebox.showinfo("Success", "Attendance saved successfully!")
             dialog.destroy()
             self.refresh_students()
@@ -310,32 +318,59 @@ class StudentTab(ttk.Frame):
             filetypes=[("Excel Files", "*.xlsx")]
         )
         if filename:
-            try:
-                from attendance_system.utils.exports import export_students
-                export_students(self.db, filename)
-                messagebox.showinfo("Success", "Students exported successfully!")
-            except Exception as e:
-                messagebox.showerror("Error", f"Export failed: {str(e)}")
+            from attendance_system.ui_tkinter.export_progress import ExportProgressWindow
+            ExportProgressWindow(self, self.db, 'Students', filename).start()
     
     def import_students(self):
-        """Import students from Excel"""
+        """Import students from Excel or CSV on a background thread"""
+        if self.import_job is not None:
+            self.import_job.cancel()
+            self.import_status.config(text="Cancelling...")
+            return
+        
         filename = filedialog.askopenfilename(
-            filetypes=[("Excel Files", "*.xlsx *.xls")]
+            filetypes=[
+                ("Spreadsheets", "*.xlsx *.xls *.csv *.tsv"),
+                ("Excel Files", "*.xlsx *.xls"),
+                ("CSV Files", "*.csv *.tsv *.txt")
+            ]
         )
         if filename:
-            try:
-                from attendance_system.utils.imports import ExcelImporter
-                importer = ExcelImporter(self.db)
-                result = importer.import_students(filename)
-                
-                if result['success']:
-                    messagebox.showinfo(
-                        "Success",
-                        f"Imported {result['imported']} students successfully!\n"
-                        f"Skipped {result['skipped']} duplicates."
-                    )
-                    self.refresh_students()
-                else:
-                    messagebox.showerror("Error", result.get('error', 'Import failed'))
-            except Exception as e:
-                messagebox.showerror("Error", f"Import failed: {str(e)}")
\ No newline at end of file
+            from attendance_system.utils.jobs import ImportJob
+            self.import_job = ImportJob(self.db.db_path, 'Students', filename)
+            self.import_job.start()
+        
+            self.import_btn.config(text="Cancel Import", bootstyle="danger-outline")
+            self.import_status.config(text="Starting import...")
+            self.after(100, self.poll_import)
+    
+    def poll_import(self):
+        """Pick up progress from the import thread without blocking the UI"""
+        from attendance_system.utils.jobs import progress_text
+        
+        for event in self.import_job.poll():
+            if event[0] == 'progress':
+                self.import_status.config(text=progress_text(event[1], event[2]))
+            else:
+                self.import_finished(event[1])
+                return
+        
+        self.after(100, self.poll_import)
+    
+    def import_finished(self, result):
+        """Report the result of a background import"""
+        self.import_job = None
+        self.import_btn.config(text="Import from Excel", bootstyle="info-outline")
+        self.import_status.config(text="")
+        
+        if result['success']:
+            messagebox.showinfo(
+                "Success",
+                f"Imported {result['imported']} students successfully!\n"
+                f"Skipped {result['skipped']} duplicates."
+            )
+        else:
+            messagebox.showerror("Error", result['message'])
+        
+        if result['imported']:
+            self.refresh_students()
@@ -28,11 +28,31 @@ def get_letter_grade(percentage: float) -> float:
         return 5.00
 
 
+GRADE_COMPONENTS = ['Quizzes', 'Assignments', 'Midterm', 'Final Exam']
+
+
+def get_weights(db: DBManager) -> Dict[str, float]:
+    """Get grading weights as fractions keyed by component"""
+    config = db.get_grading_config()
+    return {comp: weight / 100.0 for comp, weight in config}
+
+
+def apply_weights(grades: Dict[str, float], weights: Dict[str, float]) -> Dict:
+    """Combine component percentages into a final grade"""
+    final_grade = sum(grades.get(comp, 0) * weights.get(comp, 0) for comp in weights.keys())
+    letter = get_letter_grade(final_grade)
+    
+    return {
+        'grades': grades,
+        'final': final_grade,
+        'letter': letter
+    }
+
+
 def calculate_final_grade(db: DBManager, student_id: str) -> Dict:
     """Calculate final grade for a student"""
     # Get grading weights
-    config = db.get_grading_config()
-    weights = {comp: weight / 100.0 for comp, weight in config}
+    weights = get_weights(db)
     
     grades = {}
     
@@ -42,36 +62,48 @@ def calculate_final_grade(db: DBManager, student_id: str) -> Dict:
     grades['Attendance'] = attendance_pct
     
     # Calculate average for each assessment type
-    for component in ['Quizzes', 'Assignments', 'Midterm', 'Final Exam']:
+    for component in GRADE_COMPONENTS:
         avg = db.get_student_grades_by_type(student_id, component)
         grades[component] = avg if avg else 0.0
     
-    # Calculate weighted final grade
-    final_grade = sum(grades.get(comp, 0) * weights.get(comp, 0) for comp in weights.keys())
-    letter = get_letter_grade(final_grade)
+    return apply_weights(grades, weights)
+
+
+def build_report_entry(student_id: str, name: str, course: str, email: str,
+                       total: int, present: int, absent: int,
+                       averages: Dict, weights: Dict[str, float]) -> Dict:
+    """Report row for one student from their attendance counts and component averages"""
+    attendance_pct = (present / total * 100) if total > 0 else 0
+    
+    grades = {'Attendance': attendance_pct}
+    for component in GRADE_COMPONENTS:
+        avg = averages.get((student_id, component))
+        grades[component] = avg if avg else 0.0
     
     return {
-        'grades': grades,
-        'final': final_grade,
-        'letter': letter
+        'student_id': student_id,
+        'name': name,
+        'course': course,
+        'email': email,
+        'total_sessions': total,
+        'present': present,
+        'absent': absent,
+        'attendance_percentage': attendance_pct,
+        **apply_weights(grades, weights)
     }
 
 
 def generate_report(db: DBManager) -> List[Dict]:
-    """Generate comprehensive grade report for all students"""
-    students = db.get_all_students()
-    report_data = []
+    """Generate comprehensive grade report for all students
     
-    for student_id, name, course, email in students:
-        grade_data = calculate_final_grade(db, student_id)
-        report_data.append({
-            'student_id': student_id,
-            'name': name,
-            'course': course,
-            'email': email,
-            **grade_data
-        })
+    Attendance and component averages for the whole class are fetched with
+    grouped queries up front, so the cost no longer grows with one round
+    trip per student per component.
+    """
+    weights = get_weights(db)
+    averages = db.get_all_grade_averages()
     
-    return report_data
-
-
+    return [
+        build_report_entry(*student, averages, weights)
+        for student in db.get_students_with_attendance()
+    ]
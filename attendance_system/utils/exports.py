@@ -1,14 +1,296 @@
 """
 Export utilities for the attendance system
 """
+import os
+import csv
+import json
+import atexit
+import shutil
+import hashlib
+import tempfile
+from collections import OrderedDict
+from contextlib import contextmanager
 from datetime import datetime
+from itertools import islice
 import openpyxl
-from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.formatting.rule import CellIsRule
+from openpyxl.styles import Font, PatternFill, Alignment, Border, Side, NamedStyle
 from openpyxl.utils import get_column_letter
-from attendance_system.utils.calculations import generate_report
+from attendance_system.utils.calculations import (
+    GRADE_COMPONENTS, build_report_entry, generate_report, get_weights
+)
 
+# Rows buffered before a sheet's column widths are fixed; write-only sheets
+# need their widths before the first row goes out
+WIDTH_SAMPLE_ROWS = 1000
 
-def export_report(db, filename, report_data=None):
+# Rows between progress callbacks of the Excel exporters
+PROGRESS_ROWS = 1000
+
+# Finished workbooks kept by export_cache
+EXPORT_CACHE_ENTRIES = 8
+
+HEADER_COLORS = {
+    'students': "0066CC",
+    'grades': "059669",
+    'report': "DC2626",
+    'attendance': "7C3AED",
+}
+
+
+def _create_workbook():
+    """Write-only workbook with the named styles used by every export"""
+    wb = openpyxl.Workbook(write_only=True)
+    border = Border(
+        left=Side(style='thin'),
+        right=Side(style='thin'),
+        top=Side(style='thin'),
+        bottom=Side(style='thin')
+    )
+    
+    for name, color in HEADER_COLORS.items():
+        wb.add_named_style(NamedStyle(
+            name=f"header_{name}",
+            fill=PatternFill(start_color=color, end_color=color, fill_type="solid"),
+            font=Font(bold=True, color="FFFFFF", size=12),
+            alignment=Alignment(horizontal="center", vertical="center"),
+            border=border
+        ))
+    
+    wb.add_named_style(NamedStyle(
+        name="text",
+        alignment=Alignment(horizontal="left", vertical="center"),
+        border=border
+    ))
+    wb.add_named_style(NamedStyle(
+        name="number",
+        alignment=Alignment(horizontal="center", vertical="center"),
+        border=border
+    ))
+    wb.add_named_style(NamedStyle(
+        name="present",
+        fill=PatternFill(start_color="D4EDDA", end_color="D4EDDA", fill_type="solid"),
+        font=Font(bold=True, color="155724"),
+        alignment=Alignment(horizontal="left", vertical="center"),
+        border=border
+    ))
+    wb.add_named_style(NamedStyle(
+        name="absent",
+        fill=PatternFill(start_color="F8D7DA", end_color="F8D7DA", fill_type="solid"),
+        font=Font(bold=True, color="721C24"),
+        alignment=Alignment(horizontal="left", vertical="center"),
+        border=border
+    ))
+    wb.add_named_style(NamedStyle(name="label", font=Font(bold=True)))
+    
+    return wb
+
+
+class _RowProgress:
+    """Counts rows written across a workbook's sheets, reporting every PROGRESS_ROWS"""
+    
+    def __init__(self, progress):
+        self.progress = progress
+        self.rows = 0
+    
+    def __call__(self):
+        self.rows += 1
+        if self.rows % PROGRESS_ROWS == 0:
+            self.progress(self.rows)
+
+
+class _StreamingSheet:
+    """
+    Appends styled rows to a write-only worksheet
+    
+    column_styles gives each column a named style, or a dict choosing the
+    style by cell value (key None is the fallback). One WriteOnlyCell per
+    column and style is reused for every row. The first WIDTH_SAMPLE_ROWS
+    rows are held back to size the columns, then rows stream straight to
+    disk, so memory does not grow with the row count.
+    
+    progress, if given, is a _RowProgress shared by the workbook's sheets.
+    """
+    
+    def __init__(self, wb, title, headers, header_style, column_styles, progress=None):
+        self.ws = wb.create_sheet(title)
+        self.column_styles = column_styles
+        self.progress = progress
+        self.rows = 0
+        self._cells = {}
+        self._widths = [len(str(header)) for header in headers]
+        self._buffer = []
+        self._buffer.append([self._cell(i, header_style, header) for i, header in enumerate(headers)])
+    
+    def _cell(self, column, style, value):
+        """Styled cell holding value; reused across rows once streaming"""
+        if self._buffer is not None:
+            # Buffered rows are written later, so each needs its own cells
+            cell = WriteOnlyCell(self.ws, value=value)
+            cell.style = style
+            return cell
+        
+        key = (column, style)
+        cell = self._cells.get(key)
+        if cell is None:
+            cell = self._cells[key] = WriteOnlyCell(self.ws)
+            cell.style = style
+        cell.value = value
+        return cell
+    
+    def append(self, values):
+        """Write one data row"""
+        row = []
+        for i, value in enumerate(values):
+            style = self.column_styles[i]
+            if isinstance(style, dict):
+                style = style.get(value, style[None])
+            row.append(self._cell(i, style, value))
+        self.rows += 1
+        if self.progress is not None:
+            self.progress()
+        
+        if self._buffer is None:
+            self.ws.append(row)
+            return
+        
+        for i, value in enumerate(values):
+            self._widths[i] = max(self._widths[i], len(str(value)))
+        self._buffer.append(row)
+        if len(self._buffer) > WIDTH_SAMPLE_ROWS:
+            self._flush()
+    
+    def _flush(self):
+        """Fix column widths from the sample and write the buffered rows"""
+        for i, width in enumerate(self._widths, 1):
+            self.ws.column_dimensions[get_column_letter(i)].width = min(width + 2, 50)
+        
+        buffer, self._buffer = self._buffer, None
+        for row in buffer:
+            self.ws.append(row)
+    
+    def close(self):
+        """Write anything still buffered; call once after the last row"""
+        if self._buffer is not None:
+            self._flush()
+
+
+def _add_status_rules(ws, cell_range):
+    """Color attendance codes over a whole range with one rule per code"""
+    for code, (fill_color, font_color) in MATRIX_CODE_COLORS.items():
+        ws.conditional_formatting.add(cell_range, CellIsRule(
+            operator='equal',
+            formula=[f'"{code}"'],
+            fill=PatternFill(start_color=fill_color, end_color=fill_color, fill_type="solid"),
+            font=Font(bold=True, color=font_color)
+        ))
+
+
+def _append_labels(wb, title, rows):
+    """Small label/value sheet with the labels in bold"""
+    ws = wb.create_sheet(title)
+    for label, value in rows:
+        cell = WriteOnlyCell(ws, value=label)
+        cell.style = "label"
+        ws.append([cell, value])
+
+
+# Attendance matrix: one letter per status, colored by conditional formatting
+MATRIX_CODES = {'Present': 'P', 'Absent': 'A', 'Late': 'L', 'Excused': 'E'}
+MATRIX_CODE_COLORS = {
+    'P': ("D4EDDA", "155724"),
+    'A': ("F8D7DA", "721C24"),
+    'L': ("FFF3CD", "856404"),
+    'E': ("D1ECF1", "0C5460"),
+}
+MATRIX_HEADERS = ["Student ID", "Name", "Course"]
+
+# Column layouts shared by the single-table exports and the term package
+STUDENT_HEADERS = ["Student ID", "Name", "Course", "Email", "Total Sessions", "Present", "Attendance %"]
+STUDENT_STYLES = ["text"] * 4 + ["number"] * 3
+
+GRADE_HEADERS = ["Student ID", "Name", "Assessment Type", "Assessment Name", "Score", "Max Score", "Percentage", "Date"]
+GRADE_STYLES = ["text"] * 4 + ["number"] * 3 + ["text"]
+
+ATTENDANCE_HEADERS = ["Date", "Student ID", "Student Name", "Course", "Status"]
+ATTENDANCE_STYLES = ["text"] * 4 + [{"Present": "present", "Absent": "absent", None: "text"}]
+
+REPORT_HEADERS = ["Student ID", "Name", "Course", "Total Sessions", "Present", "Absent", "Attendance %"]
+REPORT_STYLES = ["text"] * 3 + ["number"] * 4
+
+FINAL_GRADE_HEADERS = ["Student ID", "Name", "Course"] + ["Attendance %"] + \
+    [f"{component} %" for component in GRADE_COMPONENTS] + ["Final Grade", "Grade Point"]
+FINAL_GRADE_STYLES = ["text"] * 3 + ["number"] * (len(FINAL_GRADE_HEADERS) - 3)
+
+
+def _student_row(student):
+    """Students sheet row from a get_students_with_attendance() tuple"""
+    student_id, name, course, email, total_sessions, present_count, _absent_count = student
+    
+    # Calculate attendance percentage
+    attendance_pct = 0
+    if total_sessions > 0:
+        attendance_pct = (present_count / total_sessions) * 100
+    
+    return [
+        student_id,
+        name,
+        course or "",
+        email or "",
+        total_sessions,
+        present_count,
+        f"{attendance_pct:.1f}%"
+    ]
+
+
+def _grade_row(grade):
+    """Grades sheet row from a get_all_grades() tuple"""
+    student_id, name, assessment_type, assessment_name, score, max_score, date = grade
+    
+    # Calculate percentage
+    percentage = (score / max_score * 100) if max_score > 0 else 0
+    
+    return [
+        student_id,
+        name,
+        assessment_type,
+        assessment_name,
+        score,
+        max_score,
+        f"{percentage:.1f}%",
+        date
+    ]
+
+
+def _report_row(student):
+    """Attendance report row from a generate_report() entry"""
+    return [
+        student.get('student_id', ''),
+        student.get('name', ''),
+        student.get('course', ''),
+        student.get('total_sessions', 0),
+        student.get('present', 0),
+        student.get('absent', 0),
+        f"{student.get('attendance_percentage', 0):.1f}%"
+    ]
+
+
+def _final_grade_row(student):
+    """Final grades row from a generate_report() entry"""
+    grades = student['grades']
+    return [
+        student['student_id'],
+        student['name'],
+        student['course'] or "",
+        f"{grades['Attendance']:.1f}%",
+        *(f"{grades[component]:.1f}%" for component in GRADE_COMPONENTS),
+        f"{student['final']:.1f}%",
+        f"{student['letter']:.2f}"
+    ]
+
+
+def export_report(db, filename, report_data=None, progress=None):
     """
     Export a comprehensive attendance report to Excel
     
@@ -16,6 +298,7 @@ def export_report(db, filename, report_data=None):
         db: DBManager instance
         filename: Path to save the Excel file
         report_data: Optional pre-generated report data
+        progress: Optional callable given the number of rows written so far
     """
     # Ensure filename has .xlsx extension
     if not filename.endswith('.xlsx'):
@@ -25,379 +308,422 @@ def export_report(db, filename, report_data=None):
     if report_data is None:
         report_data = generate_report(db)
     
-    wb = openpyxl.Workbook()
-    ws = wb.active
-    ws.title = "Attendance Report"
-    
-    # Define styles
-    header_fill = PatternFill(start_color="DC2626", end_color="DC2626", fill_type="solid")
-    header_font = Font(bold=True, color="FFFFFF", size=12)
-    border = Border(
-        left=Side(style='thin'),
-        right=Side(style='thin'),
-        top=Side(style='thin'),
-        bottom=Side(style='thin')
-    )
-    
-    # Headers
-    headers = ["Student ID", "Name", "Course", "Total Sessions", "Present", "Absent", "Attendance %"]
-    ws.append(headers)
-    
-    # Style headers
-    for col_num, header in enumerate(headers, 1):
-        cell = ws.cell(row=1, column=col_num)
-        cell.fill = header_fill
-        cell.font = header_font
-        cell.alignment = Alignment(horizontal="center", vertical="center")
-        cell.border = border
+    wb = _create_workbook()
+    counter = _RowProgress(progress) if progress else None
+    sheet = _StreamingSheet(wb, "Attendance Report", REPORT_HEADERS, "header_report", REPORT_STYLES, counter)
     
     # Add report data
     for student in report_data:
-        row_data = [
-            student.get('student_id', ''),
-            student.get('name', ''),
-            student.get('course', ''),
-            student.get('total_sessions', 0),
-            student.get('present', 0),
-            student.get('absent', 0),
-            f"{student.get('attendance_percentage', 0):.1f}%"
-        ]
-        ws.append(row_data)
-    
-    # Style data cells
-    for row in ws.iter_rows(min_row=2, max_row=ws.max_row, min_col=1, max_col=len(headers)):
-        for cell in row:
-            cell.border = border
-            cell.alignment = Alignment(horizontal="left", vertical="center")
-            
-            # Center align for numeric columns
-            if cell.column in [4, 5, 6, 7]:
-                cell.alignment = Alignment(horizontal="center", vertical="center")
-    
-    # Auto-adjust column widths
-    for col_num in range(1, len(headers) + 1):
-        column_letter = get_column_letter(col_num)
-        max_length = 0
-        
-        for cell in ws[column_letter]:
-            try:
-                if len(str(cell.value)) > max_length:
-                    max_length = len(str(cell.value))
-            except:
-                pass
-        
-        adjusted_width = min(max_length + 2, 50)
-        ws.column_dimensions[column_letter].width = adjusted_width
+        sheet.append(_report_row(student))
+    sheet.close()
     
     # Add summary sheet
-    summary_ws = wb.create_sheet("Summary")
-    summary_ws.append(["Report Generated", datetime.now().strftime("%Y-%m-%d %H:%M:%S")])
-    summary_ws.append(["Total Students", len(report_data)])
-    
+    summary = [
+        ("Report Generated", datetime.now().strftime("%Y-%m-%d %H:%M:%S")),
+        ("Total Students", len(report_data)),
+    ]
     if report_data:
         avg_attendance = sum(s.get('attendance_percentage', 0) for s in report_data) / len(report_data)
-        summary_ws.append(["Average Attendance", f"{avg_attendance:.1f}%"])
-    
-    # Style summary
-    for cell in summary_ws["A"]:
-        cell.font = Font(bold=True)
+        summary.append(("Average Attendance", f"{avg_attendance:.1f}%"))
+    _append_labels(wb, "Summary", summary)
     
     # Save the workbook
     wb.save(filename)
     return True
 
 
-def export_students(db, filename):
+def export_students(db, filename, progress=None):
     """
     Export students and their attendance data to Excel
     
     Args:
         db: DBManager instance
         filename: Path to save the Excel file (should end with .xlsx)
+        progress: Optional callable given the number of rows written so far
     """
     # Ensure filename has .xlsx extension
     if not filename.endswith('.xlsx'):
         filename += '.xlsx'
     
-    # Create a new workbook
-    wb = openpyxl.Workbook()
-    ws = wb.active
-    ws.title = "Students"
-    
-    # Define styles
-    header_fill = PatternFill(start_color="0066CC", end_color="0066CC", fill_type="solid")
-    header_font = Font(bold=True, color="FFFFFF", size=12)
-    border = Border(
-        left=Side(style='thin'),
-        right=Side(style='thin'),
-        top=Side(style='thin'),
-        bottom=Side(style='thin')
-    )
-    
-    # Headers
-    headers = ["Student ID", "Name", "Course", "Email", "Total Sessions", "Present", "Attendance %"]
-    ws.append(headers)
-    
-    # Style headers
-    for col_num, header in enumerate(headers, 1):
-        cell = ws.cell(row=1, column=col_num)
-        cell.fill = header_fill
-        cell.font = header_font
-        cell.alignment = Alignment(horizontal="center", vertical="center")
-        cell.border = border
-    
-    # Get students with attendance data
-    students = db.get_students_with_attendance()
+    wb = _create_workbook()
+    counter = _RowProgress(progress) if progress else None
+    sheet = _StreamingSheet(wb, "Students", STUDENT_HEADERS, "header_students", STUDENT_STYLES, counter)
     
     # Add student data
-    for student in students:
-        student_id, name, course, email, total_sessions, present_count = student
-        
-        # Calculate attendance percentage
-        attendance_pct = 0
-        if total_sessions > 0:
-            attendance_pct = (present_count / total_sessions) * 100
-        
-        row_data = [
-            student_id,
-            name,
-            course or "",
-            email or "",
-            total_sessions,
-            present_count,
-            f"{attendance_pct:.1f}%"
-        ]
-        ws.append(row_data)
-    
-    # Style data cells and auto-adjust column widths
-    for row in ws.iter_rows(min_row=2, max_row=ws.max_row, min_col=1, max_col=len(headers)):
-        for cell in row:
-            cell.border = border
-            cell.alignment = Alignment(horizontal="left", vertical="center")
-            
-            # Center align for numeric columns
-            if cell.column in [5, 6, 7]:  # Total Sessions, Present, Attendance %
-                cell.alignment = Alignment(horizontal="center", vertical="center")
-    
-    # Auto-adjust column widths
-    for col_num in range(1, len(headers) + 1):
-        column_letter = get_column_letter(col_num)
-        max_length = 0
-        
-        for cell in ws[column_letter]:
-            try:
-                if len(str(cell.value)) > max_length:
-                    max_length = len(str(cell.value))
-            except:
-                pass
-        
-        adjusted_width = min(max_length + 2, 50)
-        ws.column_dimensions[column_letter].width = adjusted_width
+    for student in db.get_students_with_attendance():
+        sheet.append(_student_row(student))
+    sheet.close()
     
     # Add metadata sheet
-    metadata_ws = wb.create_sheet("Export Info")
-    metadata_ws.append(["Export Date", datetime.now().strftime("%Y-%m-%d %H:%M:%S")])
-    metadata_ws.append(["Total Students", len(students)])
-    metadata_ws.append(["Generated By", "Attendance System"])
-    
-    # Style metadata
-    for cell in metadata_ws["A"]:
-        cell.font = Font(bold=True)
+    _append_labels(wb, "Export Info", [
+        ("Export Date", datetime.now().strftime("%Y-%m-%d %H:%M:%S")),
+        ("Total Students", sheet.rows),
+        ("Generated By", "Attendance System"),
+    ])
     
     # Save the workbook
     wb.save(filename)
     return True
 
 
-def export_grades(db, filename):
+def export_grades(db, filename, progress=None):
     """
     Export all grades to Excel
     
     Args:
         db: DBManager instance
         filename: Path to save the Excel file
+        progress: Optional callable given the number of rows written so far
     """
     # Ensure filename has .xlsx extension
     if not filename.endswith('.xlsx'):
         filename += '.xlsx'
     
-    wb = openpyxl.Workbook()
-    ws = wb.active
-    ws.title = "Grades"
-    
-    # Define styles
-    header_fill = PatternFill(start_color="059669", end_color="059669", fill_type="solid")
-    header_font = Font(bold=True, color="FFFFFF", size=12)
-    border = Border(
-        left=Side(style='thin'),
-        right=Side(style='thin'),
-        top=Side(style='thin'),
-        bottom=Side(style='thin')
-    )
-    
-    # Headers
-    headers = ["Student ID", "Name", "Assessment Type", "Assessment Name", "Score", "Max Score", "Percentage", "Date"]
-    ws.append(headers)
-    
-    # Style headers
-    for col_num, header in enumerate(headers, 1):
-        cell = ws.cell(row=1, column=col_num)
-        cell.fill = header_fill
-        cell.font = header_font
-        cell.alignment = Alignment(horizontal="center", vertical="center")
-        cell.border = border
-    
-    # Get all grades
-    grades = db.get_all_grades()
+    wb = _create_workbook()
+    counter = _RowProgress(progress) if progress else None
+    sheet = _StreamingSheet(wb, "Grades", GRADE_HEADERS, "header_grades", GRADE_STYLES, counter)
     
     # Add grade data
-    for grade in grades:
-        student_id, name, assessment_type, assessment_name, score, max_score, date = grade
-        
-        # Calculate percentage
-        percentage = (score / max_score * 100) if max_score > 0 else 0
-        
-        row_data = [
-            student_id,
-            name,
-            assessment_type,
-            assessment_name,
-            score,
-            max_score,
-            f"{percentage:.1f}%",
-            date
-        ]
-        ws.append(row_data)
-    
-    # Style data cells
-    for row in ws.iter_rows(min_row=2, max_row=ws.max_row, min_col=1, max_col=len(headers)):
-        for cell in row:
-            cell.border = border
-            cell.alignment = Alignment(horizontal="left", vertical="center")
-            
-            # Center align for numeric columns
-            if cell.column in [5, 6, 7]:  # Score, Max Score, Percentage
-                cell.alignment = Alignment(horizontal="center", vertical="center")
-    
-    # Auto-adjust column widths
-    for col_num in range(1, len(headers) + 1):
-        column_letter = get_column_letter(col_num)
-        max_length = 0
-        
-        for cell in ws[column_letter]:
-            try:
-                if len(str(cell.value)) > max_length:
-                    max_length = len(str(cell.value))
-            except:
-                pass
-        
-        adjusted_width = min(max_length + 2, 50)
-        ws.column_dimensions[column_letter].width = adjusted_width
+    for grade in db.iter_grades():
+        sheet.append(_grade_row(grade))
+    sheet.close()
     
     # Save the workbook
     wb.save(filename)
     return True
 
 
-def export_attendance_detailed(db, filename):
+def export_attendance_detailed(db, filename, progress=None):
     """
     Export detailed attendance records to Excel
     
     Args:
         db: DBManager instance
         filename: Path to save the Excel file
+        progress: Optional callable given the number of rows written so far
     """
     # Ensure filename has .xlsx extension
     if not filename.endswith('.xlsx'):
         filename += '.xlsx'
     
-    wb = openpyxl.Workbook()
-    ws = wb.active
-    ws.title = "Attendance Records"
+    wb = _create_workbook()
+    counter = _RowProgress(progress) if progress else None
+    sheet = _StreamingSheet(wb, "Attendance Records", ATTENDANCE_HEADERS, "header_attendance", ATTENDANCE_STYLES, counter)
     
-    # Define styles
-    header_fill = PatternFill(start_color="7C3AED", end_color="7C3AED", fill_type="solid")
-    header_font = Font(bold=True, color="FFFFFF", size=12)
-    present_fill = PatternFill(start_color="D4EDDA", end_color="D4EDDA", fill_type="solid")
-    absent_fill = PatternFill(start_color="F8D7DA", end_color="F8D7DA", fill_type="solid")
-    border = Border(
-        left=Side(style='thin'),
-        right=Side(style='thin'),
-        top=Side(style='thin'),
-        bottom=Side(style='thin')
-    )
+    # One JOIN, ordered by the database and streamed straight into the sheet
+    try:
+        for record in db.iter_attendance_records():
+            sheet.append(record)
+        sheet.close()
+    except Exception as e:
+        print(f"Error fetching attendance records: {e}")
+        return False
+    
+    # Save the workbook
+    wb.save(filename)
+    return True
+
+
+def export_attendance_matrix(db, filename, start_date=None, end_date=None, progress=None):
+    """
+    Export attendance as a students x dates matrix
+    
+    Each cell holds the status code from MATRIX_CODES (blank if no record).
+    Colors come from conditional formatting rules over the whole grid,
+    so cells carry one shared style instead of a fill and font each.
     
-    # Headers
-    headers = ["Date", "Student ID", "Student Name", "Course", "Status"]
-    ws.append(headers)
+    Args:
+        db: DBManager instance
+        filename: Path to save the Excel file
+        start_date: First date to include (YYYY-MM-DD), or None for all
+        end_date: Last date to include (YYYY-MM-DD), or None for all
+        progress: Optional callable given the number of rows written so far
+    """
+    # Ensure filename has .xlsx extension
+    if not filename.endswith('.xlsx'):
+        filename += '.xlsx'
     
-    # Style headers
-    for col_num, header in enumerate(headers, 1):
-        cell = ws.cell(row=1, column=col_num)
-        cell.fill = header_fill
-        cell.font = header_font
-        cell.alignment = Alignment(horizontal="center", vertical="center")
-        cell.border = border
+    wb = _create_workbook()
+    counter = _RowProgress(progress) if progress else None
     
-    # Get all attendance records (you'll need to add this method to db_manager if it doesn't exist)
     try:
-        # Get all students and their attendance
-        students = db.get_all_students()
-        all_records = []
-        
-        for student_id, name, course, email in students:
-            # Get attendance for this student
-            db.cursor.execute("""
-                SELECT date, status FROM attendance 
-                WHERE student_id = ? 
-                ORDER BY date DESC
-            """, (student_id,))
-            attendance_records = db.cursor.fetchall()
-            
-            for date, status in attendance_records:
-                all_records.append((date, student_id, name, course or "", status))
-        
-        # Sort by date (most recent first)
-        all_records.sort(key=lambda x: x[0], reverse=True)
-        
-        # Add attendance data
-        for record in all_records:
-            ws.append(record)
+        dates = db.get_attendance_dates(start_date, end_date)
+        headers = MATRIX_HEADERS + dates
+        sheet = _StreamingSheet(wb, "Attendance Matrix", headers, "header_attendance",
+                                ["text"] * len(MATRIX_HEADERS) + ["number"] * len(dates), counter)
+        # Write-only sheets emit their view settings with the first row
+        sheet.ws.freeze_panes = f"{get_column_letter(len(MATRIX_HEADERS) + 1)}2"
         
+        for student_id, name, course, statuses in db.iter_attendance_pivot(start_date, end_date):
+            codes = [MATRIX_CODES.get(statuses.get(date), statuses.get(date)) for date in dates]
+            sheet.append([student_id, name, course] + codes)
+        sheet.close()
     except Exception as e:
-        print(f"Error fetching attendance records: {e}")
+        print(f"Error fetching attendance matrix: {e}")
         return False
     
-    # Style data cells
-    for row_num, row in enumerate(ws.iter_rows(min_row=2, max_row=ws.max_row, min_col=1, max_col=len(headers)), start=2):
-        for cell in row:
-            cell.border = border
-            cell.alignment = Alignment(horizontal="left", vertical="center")
+    if dates and sheet.rows:
+        first_column = get_column_letter(len(MATRIX_HEADERS) + 1)
+        last_column = get_column_letter(len(headers))
+        _add_status_rules(sheet.ws, f"{first_column}2:{last_column}{sheet.rows + 1}")
+    
+    # Save the workbook
+    wb.save(filename)
+    return True
+
+
+def export_term_package(db, filename, progress=None):
+    """
+    Export the end-of-term archive as one workbook
+    
+    Writes Students, Grades, Attendance, Final Grades and Summary sheets
+    in a single pass: the roster with attendance counts and the grade
+    averages are read once and feed both the Students and Final Grades
+    sheets, while grades and attendance stream from their own cursors.
+    
+    Args:
+        db: DBManager instance
+        filename: Path to save the Excel file
+        progress: Optional callable given the number of rows written so far
+    """
+    # Ensure filename has .xlsx extension
+    if not filename.endswith('.xlsx'):
+        filename += '.xlsx'
+    
+    wb = _create_workbook()
+    counter = _RowProgress(progress) if progress else None
+    
+    # Sheets appear in creation order
+    students_sheet = _StreamingSheet(wb, "Students", STUDENT_HEADERS, "header_students", STUDENT_STYLES, counter)
+    grades_sheet = _StreamingSheet(wb, "Grades", GRADE_HEADERS, "header_grades", GRADE_STYLES, counter)
+    attendance_sheet = _StreamingSheet(wb, "Attendance", ATTENDANCE_HEADERS, "header_attendance", ATTENDANCE_STYLES, counter)
+    final_sheet = _StreamingSheet(wb, "Final Grades", FINAL_GRADE_HEADERS, "header_report", FINAL_GRADE_STYLES, counter)
+    
+    # Roster pass: one row per student in both Students and Final Grades
+    weights = get_weights(db)
+    averages = db.get_all_grade_averages()
+    total_attendance = 0.0
+    total_final = 0.0
+    
+    for student in db.get_students_with_attendance():
+        students_sheet.append(_student_row(student))
         
-        # Color code based on status
-        status_cell = ws.cell(row=row_num, column=5)
-        if status_cell.value == "Present":
-            status_cell.fill = present_fill
-            status_cell.font = Font(bold=True, color="155724")
-        elif status_cell.value == "Absent":
-            status_cell.fill = absent_fill
-            status_cell.font = Font(bold=True, color="721C24")
-    
-    # Auto-adjust column widths
-    for col_num in range(1, len(headers) + 1):
-        column_letter = get_column_letter(col_num)
-        max_length = 0
+        entry = build_report_entry(*student, averages, weights)
+        final_sheet.append(_final_grade_row(entry))
+        total_attendance += entry['attendance_percentage']
+        total_final += entry['final']
+    students_sheet.close()
+    final_sheet.close()
+    
+    for grade in db.iter_grades():
+        grades_sheet.append(_grade_row(grade))
+    grades_sheet.close()
+    
+    for record in db.iter_attendance_records():
+        attendance_sheet.append(record)
+    attendance_sheet.close()
+    
+    # Summary from the counts gathered on the way
+    student_count = students_sheet.rows
+    summary = [
+        ("Report Generated", datetime.now().strftime("%Y-%m-%d %H:%M:%S")),
+        ("Total Students", student_count),
+        ("Total Grades", grades_sheet.rows),
+        ("Total Attendance Records", attendance_sheet.rows),
+    ]
+    if student_count:
+        summary.append(("Average Attendance", f"{total_attendance / student_count:.1f}%"))
+        summary.append(("Average Final Grade", f"{total_final / student_count:.1f}%"))
+    summary.extend((f"{component} Weight", f"{weight * 100:.0f}%") for component, weight in weights.items())
+    _append_labels(wb, "Summary", summary)
+    
+    # Save the workbook
+    wb.save(filename)
+    return True
+
+
+# ==================== PLAIN DATA EXPORTS ====================
+
+# Rows serialized per write call by the CSV and NDJSON exporters
+PLAIN_BATCH_SIZE = 1000
+
+# Field names of each plain dataset; also the CSV header and NDJSON keys
+PLAIN_FIELDS = {
+    'students': ['student_id', 'name', 'course', 'email', 'total_sessions', 'present',
+                 'attendance_percentage'],
+    'grades': ['student_id', 'name', 'assessment_type', 'assessment_name', 'score', 'max_score',
+               'percentage', 'date'],
+    'attendance': ['date', 'student_id', 'name', 'course', 'status'],
+    'report': ['student_id', 'name', 'course', 'attendance_percentage'] +
+              [f"{component.lower().replace(' ', '_')}_percentage" for component in GRADE_COMPONENTS] +
+              ['final_grade', 'grade_point'],
+}
+
+
+def _plain_rows(db, dataset):
+    """
+    Unformatted rows of a plain dataset, streamed from the database
+    Percentages are numbers rounded to 2 places rather than "85.0%" strings,
+    so downstream systems can load them without parsing.
+    """
+    if dataset == 'students':
+        for student_id, name, course, email, total, present, _absent in db.iter_students_with_attendance():
+            percentage = (present / total * 100) if total > 0 else 0.0
+            yield (student_id, name, course or "", email or "", total, present, round(percentage, 2))
+    elif dataset == 'grades':
+        for student_id, name, assessment_type, assessment_name, score, max_score, date in db.iter_grades():
+            percentage = (score / max_score * 100) if max_score > 0 else 0.0
+            yield (student_id, name, assessment_type, assessment_name, score, max_score,
+                   round(percentage, 2), date)
+    elif dataset == 'attendance':
+        yield from db.iter_attendance_records()
+    elif dataset == 'report':
+        weights = get_weights(db)
+        averages = db.get_all_grade_averages()
+        for student in db.iter_students_with_attendance():
+            entry = build_report_entry(*student, averages, weights)
+            grades = entry['grades']
+            yield (entry['student_id'], entry['name'], entry['course'] or "",
+                   round(grades['Attendance'], 2),
+                   *(round(grades[component], 2) for component in GRADE_COMPONENTS),
+                   round(entry['final'], 2), round(entry['letter'], 2))
+    else:
+        raise ValueError(f"Unknown dataset: {dataset}")
+
+
+@contextmanager
+def _text_output(target):
+    """Yield a writable text stream for a path or an already open file-like object"""
+    if hasattr(target, 'write'):
+        yield target
+    else:
+        with open(target, 'w', newline='', encoding='utf-8') as f:
+            yield f
+
+
+def _batches(rows):
+    """Split a row iterator into lists of PLAIN_BATCH_SIZE"""
+    rows = iter(rows)
+    while True:
+        batch = list(islice(rows, PLAIN_BATCH_SIZE))
+        if not batch:
+            return
+        yield batch
+
+
+def export_csv(db, dataset, target, delimiter=','):
+    """
+    Export a dataset as CSV without any formatting
+    
+    Args:
+        db: DBManager instance
+        dataset: One of PLAIN_FIELDS ('students', 'grades', 'attendance', 'report')
+        target: Path, or a text file-like object opened with newline=''
+        delimiter: Field separator
+    
+    Returns:
+        Number of data rows written
+    """
+    fields = PLAIN_FIELDS.get(dataset)
+    if fields is None:
+        raise ValueError(f"Unknown dataset: {dataset}")
+    
+    count = 0
+    with _text_output(target) as f:
+        writer = csv.writer(f, delimiter=delimiter)
+        writer.writerow(fields)
+        for batch in _batches(_plain_rows(db, dataset)):
+            writer.writerows(batch)
+            count += len(batch)
+    return count
+
+
+def export_ndjson(db, dataset, target):
+    """
+    Export a dataset as newline-delimited JSON, one object per row
+    
+    Args:
+        db: DBManager instance
+        dataset: One of PLAIN_FIELDS ('students', 'grades', 'attendance', 'report')
+        target: Path, or a text file-like object
+    
+    Returns:
+        Number of objects written
+    """
+    fields = PLAIN_FIELDS.get(dataset)
+    if fields is None:
+        raise ValueError(f"Unknown dataset: {dataset}")
+    
+    encode = json.JSONEncoder(ensure_ascii=False, separators=(',', ':')).encode
+    count = 0
+    with _text_output(target) as f:
+        for batch in _batches(_plain_rows(db, dataset)):
+            f.write(''.join(encode(dict(zip(fields, row))) + '\n' for row in batch))
+            count += len(batch)
+    return count
+
+
+# ==================== EXPORT CACHE ====================
+
+class ExportCache:
+    """
+    Finished export files, reused while the data behind them is unchanged
+    
+    Keys combine the export type, its parameters, the database path and
+    DBManager.get_change_counter() of the caller's long-lived connection.
+    Those counters only grow, so a key never matches again once anything
+    has been written. Files live in a per-process temporary directory;
+    a hit is a file copy instead of a rebuild.
+    """
+    
+    def __init__(self, max_entries=EXPORT_CACHE_ENTRIES):
+        self.max_entries = max_entries
+        self._directory = None
+        self._entries = OrderedDict()
+    
+    @staticmethod
+    def key(db, export_type, params=()):
+        """Cache key for an export of db's current data"""
+        return (os.path.abspath(db.db_path), export_type, tuple(params)) + db.get_change_counter()
+    
+    def fetch(self, key, filename):
+        """Copy the cached file for key to filename; False on a miss"""
+        path = self._entries.get(key)
+        if path is None or not os.path.exists(path):
+            self._entries.pop(key, None)
+            return False
         
-        for cell in ws[column_letter]:
+        shutil.copyfile(path, filename)
+        self._entries.move_to_end(key)
+        return True
+    
+    def store(self, key, filename):
+        """Keep a copy of a freshly written export under key"""
+        if self._directory is None:
+            self._directory = tempfile.mkdtemp(prefix='attendance_exports_')
+            atexit.register(shutil.rmtree, self._directory, True)
+        
+        name = hashlib.sha256(repr(key).encode()).hexdigest() + os.path.splitext(filename)[1]
+        path = os.path.join(self._directory, name)
+        shutil.copyfile(filename, path)
+        self._entries[key] = path
+        self._entries.move_to_end(key)
+        
+        while len(self._entries) > self.max_entries:
+            _, oldest = self._entries.popitem(last=False)
             try:
-                if len(str(cell.value)) > max_length:
-                    max_length = len(str(cell.value))
-            except:
+                os.remove(oldest)
+            except OSError:
                 pass
-        
-        adjusted_width = min(max_length + 2, 50)
-        ws.column_dimensions[column_letter].width = adjusted_width
     
-    # Save the workbook
-    wb.save(filename)
-    return True
\ No newline at end of file
+    def clear(self):
+        """Drop every cached file"""
+        for path in self._entries.values():
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        self._entries.clear()
+
+
+export_cache = ExportCache()
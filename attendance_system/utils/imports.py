@@ -1,289 +1,625 @@
+import os
 import pandas as pd
 from datetime import datetime
-from PyQt5.QtWidgets import QMessageBox
+from multiprocessing import get_context
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from attendance_system.utils.readers import ChunkedReader, DEFAULT_CHUNK_SIZE, file_hash
+
+VALID_ASSESSMENT_TYPES = ['Attendance', 'Quizzes', 'Assignments', 'Midterm', 'Final Exam']
+VALID_STATUSES = ['Present', 'Absent', 'Late', 'Excused']
+STUDENT_COLUMNS = ['Student ID', 'Name', 'Course', 'Email']
+GRADE_COLUMNS = ['Student ID', 'Assessment Type', 'Assessment Name', 'Score', 'Max Score', 'Date']
+ATTENDANCE_COLUMNS = ['Student ID', 'Date', 'Status']
+
+
+def clean_student_ids(ids):
+    """
+    Normalize a Student ID column to stripped strings
+    Excel hands back numeric IDs as floats once the column has a blank
+    cell, so a trailing '.0' is dropped ('2021001.0' -> '2021001')
+    """
+    return ids.astype(str).str.strip().str.replace(r'^(\d+)\.0$', r'\1', regex=True)
+
+
+def _row_errors(messages):
+    """Prefix error messages with their spreadsheet row numbers"""
+    return ('Row ' + (messages.index.to_series() + 2).astype(str) + ': ' + messages).tolist()
+
+
+def _checked(df, columns, error, before_roster):
+    """Attach the per-row validation outcome to the normalized columns"""
+    checked = df[columns].copy()
+    checked['Error'] = error
+    checked['Before Roster'] = before_roster
+    return checked
+
+
+def validate_grades(df, today=None):
+    """
+    Check a chunk of grade rows without touching the database
+    
+    Returns GRADE_COLUMNS normalized for insert, plus 'Error' (the first
+    problem in the row, or None) and 'Before Roster' (True where that
+    problem is reported ahead of an unknown student). Pure, so it can run
+    in worker processes; apply_roster finishes the job.
+    """
+    today = today or datetime.now().strftime("%Y-%m-%d")
+    
+    # Add Date column if not present
+    if 'Date' not in df.columns:
+        df['Date'] = today
+    
+    # Remove empty rows
+    df = df.dropna(subset=['Student ID', 'Assessment Type', 'Assessment Name'])
+    
+    # Convert types
+    df['Student ID'] = clean_student_ids(df['Student ID'])
+    df['Assessment Type'] = df['Assessment Type'].astype(str).str.strip()
+    df['Assessment Name'] = df['Assessment Name'].astype(str).str.strip()
+    df['Score'] = pd.to_numeric(df['Score'].astype(str).str.strip(), errors='coerce')
+    df['Max Score'] = pd.to_numeric(df['Max Score'].astype(str).str.strip(), errors='coerce')
+    
+    # Blank dates fall back to today, like a missing Date column
+    df['Date'] = df['Date'].map(
+        lambda date: today if pd.isna(date)
+        else date.strftime("%Y-%m-%d") if hasattr(date, 'strftime')
+        else str(date).strip()
+    )
+    
+    bad_score = df['Score'].isna() | df['Max Score'].isna()
+    bad_type = ~df['Assessment Type'].isin(VALID_ASSESSMENT_TYPES)
+    bad_range = (df['Score'] < 0) | (df['Max Score'] <= 0) | (df['Score'] > df['Max Score'])
+    
+    # Lowest priority first, so each row keeps its first failing check
+    error = pd.Series(None, index=df.index, dtype=object)
+    error[bad_range] = "Invalid score range"
+    error[bad_type] = "Invalid assessment type '" + df.loc[bad_type, 'Assessment Type'] + "'"
+    error[bad_score] = "Invalid score values"
+    
+    return _checked(df, GRADE_COLUMNS, error, bad_score)
+
+
+def validate_attendance(df):
+    """
+    Check a chunk of attendance rows without touching the database
+    
+    Returns ATTENDANCE_COLUMNS with dates as YYYY-MM-DD, plus the same
+    'Error' and 'Before Roster' columns as validate_grades.
+    """
+    # Remove empty rows
+    df = df.dropna(subset=['Student ID', 'Date', 'Status'])
+    
+    # Convert types
+    df['Student ID'] = clean_student_ids(df['Student ID'])
+    df['Status'] = df['Status'].astype(str).str.strip()
+    
+    # One parse for the whole column, of text and date cells only: a number
+    # (an Excel serial, 20240105) would be read as nanoseconds since 1970
+    parseable = df['Date'].map(lambda date: isinstance(date, str) or hasattr(date, 'strftime'))
+    dates = pd.to_datetime(df['Date'].where(parseable), errors='coerce', format='mixed')
+    bad_date = dates.isna()
+    bad_status = ~df['Status'].isin(VALID_STATUSES)
+    df['Date'] = dates.dt.strftime("%Y-%m-%d")
+    
+    error = pd.Series(None, index=df.index, dtype=object)
+    error[bad_status] = "Invalid status '" + df.loc[bad_status, 'Status'] + "'"
+    error[bad_date] = "Invalid date format"
+    
+    return _checked(df, ATTENDANCE_COLUMNS, error, bad_date)
+
+
+def apply_roster(checked, roster, columns):
+    """
+    Finish validating checked rows against the set of known student IDs
+    
+    Returns (records, errors, rejected): tuples of columns ready to insert,
+    messages for the failing rows in row order, and the index of each
+    failing row. The roster check slots in between the 'Before Roster'
+    problems and the rest, as in a row-by-row validation.
+    """
+    unknown = ~checked['Student ID'].isin(roster)
+    error = checked['Error'].where(
+        checked['Before Roster'] | ~unknown,
+        'Student ' + checked['Student ID'] + ' not found'
+    )
+    failed = error.notna()
+    
+    records = list(checked.loc[~failed, columns].itertuples(index=False, name=None))
+    return records, _row_errors(error[failed]), checked.index[failed].tolist()
+
+
+# Per import type: required columns, validator, insert columns, noun
+BATCH_IMPORTS = {
+    'grades': (GRADE_COLUMNS[:5], validate_grades, GRADE_COLUMNS, "grades"),
+    'attendance': (ATTENDANCE_COLUMNS, validate_attendance, ATTENDANCE_COLUMNS, "attendance records"),
+}
+
+
+def parse_import_file(filename, import_type, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Read and validate a whole grades or attendance file
+    
+    Runs in a worker process of ExcelImporter.batch_import, so it only
+    reads the file. Returns {'filename', 'file_hash', 'rows', 'checked'}
+    with the concatenated validator output, or {'filename', 'error'}.
+    """
+    required_columns, validate, columns, noun = BATCH_IMPORTS[import_type]
+    
+    try:
+        with ChunkedReader(filename, chunk_size) as reader:
+            missing_columns = [col for col in required_columns if col not in reader.columns]
+            if missing_columns:
+                return {'filename': filename,
+                        'error': f"Missing required columns: {', '.join(missing_columns)}"}
+            
+            chunks = [validate(df) for df in reader]
+        
+        return {
+            'filename': filename,
+            'file_hash': file_hash(filename),
+            'rows': reader.rows_read,
+            'checked': pd.concat(chunks) if chunks else None
+        }
+    except FileNotFoundError:
+        return {'filename': filename, 'error': "File not found"}
+    except Exception as e:
+        return {'filename': filename, 'error': f"Import failed: {str(e)}"}
+
+
+class ImportCancelled(Exception):
+    """Raised inside a chunk's transaction to roll it back on cancel"""
 
 
 class ExcelImporter:
-    """Handles importing data from Excel files"""
+    """Handles importing data from Excel, CSV and TSV files"""
     
-    def __init__(self, db_manager):
+    def __init__(self, db_manager, chunk_size=DEFAULT_CHUNK_SIZE, cancelled=None):
         self.db = db_manager
+        self.chunk_size = chunk_size
+        # Optional callable polled once per chunk; True stops the import
+        self.cancelled = cancelled
     
-    def import_students(self, filename):
+    def import_students(self, filename, progress=None):
         """
-        Import students from Excel file
+        Import students from an Excel, CSV or TSV file
         
         Expected columns: Student ID, Name, Course, Email (optional)
+        Students deactivated by a roster sync are reactivated with the
+        file's details.
+        """
+        return self._import_file(
+            filename, ['Student ID', 'Name'], self._import_student_chunk, "students", progress
+        )
+    
+    def sync_students(self, filename, progress=None):
         """
+        Make the roster match a registrar file
+        
+        Expected columns: Student ID, Name, Course, Email (optional)
+        New IDs are inserted, students whose details differ are updated (and
+        reactivated), and active students missing from the file are marked
+        inactive. Only that delta is written, in a single transaction.
+        """
+        errors = []
+        
         try:
-            # Read Excel file
-            df = pd.read_excel(filename)
+            with ChunkedReader(filename, self.chunk_size) as reader:
+                missing_columns = [col for col in ['Student ID', 'Name'] if col not in reader.columns]
+                if missing_columns:
+                    return self._failed(f"Missing required columns: {', '.join(missing_columns)}")
+                
+                # The whole file decides who is missing, so collect it before diffing
+                columns = [col for col in STUDENT_COLUMNS if col in reader.columns]
+                chunks = []
+                for df in reader:
+                    chunks.append(df[columns])
+                    if progress:
+                        progress(reader.rows_read, reader.total_rows)
             
-            # Clean column names (remove extra spaces)
-            df.columns = df.columns.str.strip()
+            if self.cancelled and self.cancelled():
+                return self._failed("Import cancelled")
             
-            # Validate required columns
-            required_columns = ['Student ID', 'Name']
-            missing_columns = [col for col in required_columns if col not in df.columns]
+            incoming = pd.concat(chunks) if chunks else pd.DataFrame(columns=columns)
+            incoming = incoming.dropna(subset=['Student ID', 'Name'])
+            if incoming.empty:
+                return self._failed("No students found in file")
             
-            if missing_columns:
-                return {
-                    'success': False,
-                    'message': f"Missing required columns: {', '.join(missing_columns)}",
-                    'imported': 0,
-                    'skipped': 0,
-                    'errors': []
-                }
+            incoming['Student ID'] = clean_student_ids(incoming['Student ID'])
+            incoming['Name'] = incoming['Name'].astype(str).str.strip()
             
-            # Optional columns
-            if 'Course' not in df.columns:
-                df['Course'] = ''
-            if 'Email' not in df.columns:
-                df['Email'] = ''
+            duplicate = incoming.duplicated(subset='Student ID')
+            errors = [
+                f"Row {index + 2}: Student {student_id} appears more than once"
+                for index, student_id in incoming.loc[duplicate, 'Student ID'].items()
+            ]
+            incoming = incoming[~duplicate]
             
-            # Remove rows with empty Student ID or Name
-            df = df.dropna(subset=['Student ID', 'Name'])
+            current = pd.DataFrame(
+                self.db.get_roster(),
+                columns=['Student ID', 'Name (db)', 'Course (db)', 'Email (db)', 'Active']
+            )
+            merged = incoming.merge(current, on='Student ID', how='outer', indicator=True)
             
-            # Convert Student ID to string
-            df['Student ID'] = df['Student ID'].astype(str).str.strip()
-            df['Name'] = df['Name'].astype(str).str.strip()
+            # Optional columns absent from the file keep their stored values
+            for col in ['Course', 'Email']:
+                stored = merged[f'{col} (db)'].fillna('').astype(str)
+                if col in merged.columns:
+                    merged[col] = merged[col].fillna('').astype(str).str.strip()
+                else:
+                    merged[col] = stored
             
-            imported = 0
-            skipped = 0
-            errors = []
+            in_file = merged['_merge'] == 'left_only'
+            in_both = merged['_merge'] == 'both'
+            in_db = merged['_merge'] == 'right_only'
             
-            # Import each student
-            for index, row in df.iterrows():
-                student_id = row['Student ID']
-                name = row['Name']
-                course = str(row['Course']) if pd.notna(row['Course']) else ''
-                email = str(row['Email']) if pd.notna(row['Email']) else ''
-                
-                try:
-                    # Check if student already exists
-                    if self.db.student_exists(student_id):
-                        skipped += 1
-                        errors.append(f"Row {index + 2}: Student {student_id} already exists")
-                        continue
-                    
-                    # Add student
-                    self.db.add_student(student_id, name, course, email)
-                    imported += 1
-                    
-                except Exception as e:
-                    errors.append(f"Row {index + 2}: {str(e)}")
-                    skipped += 1
+            changed = in_both & (
+                (merged['Name'] != merged['Name (db)'].fillna(''))
+                | (merged['Course'] != merged['Course (db)'].fillna(''))
+                | (merged['Email'] != merged['Email (db)'].fillna(''))
+                | (merged['Active'] == 0)
+            )
+            missing = in_db & (merged['Active'] == 1)
+            
+            inserted = merged.loc[in_file, STUDENT_COLUMNS]
+            updated = merged.loc[changed, STUDENT_COLUMNS]
+            deactivated = merged.loc[missing, 'Student ID']
+            
+            self.db.apply_roster_changes(
+                inserted.itertuples(index=False, name=None),
+                updated.itertuples(index=False, name=None),
+                deactivated.tolist()
+            )
             
             return {
                 'success': True,
-                'message': f"Successfully imported {imported} students",
-                'imported': imported,
-                'skipped': skipped,
-                'errors': errors
+                'message': (f"Roster synced: {len(inserted)} added, {len(updated)} updated, "
+                            f"{len(deactivated)} deactivated"),
+                'imported': len(inserted) + len(updated),
+                'skipped': len(errors),
+                'errors': errors,
+                'inserted': len(inserted),
+                'updated': len(updated),
+                'deactivated': len(deactivated)
             }
             
         except FileNotFoundError:
-            return {
-                'success': False,
-                'message': "File not found",
-                'imported': 0,
-                'skipped': 0,
-                'errors': []
-            }
+            return self._failed("File not found")
         except Exception as e:
-            return {
-                'success': False,
-                'message': f"Import failed: {str(e)}",
-                'imported': 0,
-                'skipped': 0,
-                'errors': []
-            }
+            return self._failed(f"Import failed: {str(e)}")
     
-    def import_grades(self, filename):
+    def import_grades(self, filename, progress=None):
         """
-        Import grades from Excel file
+        Import grades from an Excel, CSV or TSV file
         
         Expected columns: Student ID, Assessment Type, Assessment Name, Score, Max Score, Date (optional)
         """
+        return self._import_file(
+            filename, BATCH_IMPORTS['grades'][0],
+            self._import_grade_chunk, "grades", progress, journal='grades'
+        )
+    
+    def import_attendance(self, filename, progress=None):
+        """
+        Import attendance from an Excel, CSV or TSV file
+        
+        Expected columns: Student ID, Date, Status
+        Status should be: Present, Absent, Late, or Excused
+        """
+        return self._import_file(
+            filename, BATCH_IMPORTS['attendance'][0],
+            self._import_attendance_chunk, "attendance records", progress, journal='attendance'
+        )
+    
+    def batch_import(self, filenames, import_type, progress=None, max_workers=None):
+        """
+        Import many grades or attendance files at once
+        
+        Files are parsed and validated in a process pool; this process is
+        the only writer and commits each file, with its journal entry, in
+        one transaction, in the order given. Files already in the journal
+        as complete are skipped. progress(files_done, total_files) is
+        called after each file.
+        
+        Returns the usual result dict summed over all files, with error
+        messages prefixed by file name and each file's own result under
+        'files'.
+        """
+        if import_type not in BATCH_IMPORTS:
+            return self._failed(f"Batch import does not support {import_type}")
+        
+        filenames = list(dict.fromkeys(filenames))
+        noun = BATCH_IMPORTS[import_type][3]
+        roster = self.db.get_student_ids()
+        results = {}
+        
+        # spawn, not fork: the GUI process may already be running threads
+        pool = ProcessPoolExecutor(max_workers=max_workers, mp_context=get_context('spawn'))
         try:
-            df = pd.read_excel(filename)
-            df.columns = df.columns.str.strip()
-            
-            # Validate required columns
-            required_columns = ['Student ID', 'Assessment Type', 'Assessment Name', 'Score', 'Max Score']
-            missing_columns = [col for col in required_columns if col not in df.columns]
-            
-            if missing_columns:
-                return {
-                    'success': False,
-                    'message': f"Missing required columns: {', '.join(missing_columns)}",
-                    'imported': 0,
-                    'skipped': 0,
-                    'errors': []
-                }
-            
-            # Add Date column if not present
-            if 'Date' not in df.columns:
-                df['Date'] = datetime.now().strftime("%Y-%m-%d")
-            
-            # Remove empty rows
-            df = df.dropna(subset=['Student ID', 'Assessment Type', 'Assessment Name'])
-            
-            # Convert types
-            df['Student ID'] = df['Student ID'].astype(str).str.strip()
-            
-            imported = 0
-            skipped = 0
-            errors = []
-            
-            # Valid assessment types
-            valid_types = ['Attendance', 'Quizzes', 'Assignments', 'Midterm', 'Final Exam']
+            futures = {
+                pool.submit(parse_import_file, filename, import_type, self.chunk_size): filename
+                for filename in filenames
+            }
             
-            for index, row in df.iterrows():
-                student_id = row['Student ID']
-                assessment_type = str(row['Assessment Type']).strip()
-                assessment_name = str(row['Assessment Name']).strip()
+            # Parse in any order but write in the order given, so a later
+            # file's attendance wins however many workers there are
+            parsed_files = {}
+            for future in as_completed(futures):
+                if self.cancelled and self.cancelled():
+                    break
                 
                 try:
-                    score = float(row['Score'])
-                    max_score = float(row['Max Score'])
-                except (ValueError, TypeError):
-                    errors.append(f"Row {index + 2}: Invalid score values")
-                    skipped += 1
-                    continue
-                
-                # Validate student exists
-                if not self.db.student_exists(student_id):
-                    errors.append(f"Row {index + 2}: Student {student_id} not found")
-                    skipped += 1
-                    continue
-                
-                # Validate assessment type
-                if assessment_type not in valid_types:
-                    errors.append(f"Row {index + 2}: Invalid assessment type '{assessment_type}'")
-                    skipped += 1
-                    continue
-                
-                # Validate scores
-                if score < 0 or max_score <= 0 or score > max_score:
-                    errors.append(f"Row {index + 2}: Invalid score range")
-                    skipped += 1
-                    continue
-                
-                try:
-                    self.db.add_grade(student_id, assessment_type, assessment_name, score, max_score)
-                    imported += 1
+                    parsed_files[futures[future]] = future.result()
                 except Exception as e:
-                    errors.append(f"Row {index + 2}: {str(e)}")
-                    skipped += 1
-            
+                    parsed_files[futures[future]] = {'filename': futures[future], 'error': f"Import failed: {str(e)}"}
+                
+                while len(results) < len(filenames) and filenames[len(results)] in parsed_files:
+                    filename = filenames[len(results)]
+                    results[filename] = self._write_parsed(parsed_files.pop(filename), import_type, roster)
+                    
+                    if progress:
+                        progress(len(results), len(filenames))
+        finally:
+            # Don't wait for parses still running when cancelled
+            pool.shutdown(wait=False, cancel_futures=True)
+        
+        imported = sum(result['imported'] for result in results.values())
+        errors = []
+        for filename in filenames:
+            if filename in results:
+                result = results[filename]
+                messages = result['errors'] if result['success'] else [result['message']]
+                errors.extend(f"{os.path.basename(filename)}: {message}" for message in messages)
+        failed = sum(not result['success'] for result in results.values())
+        
+        if len(results) < len(filenames):
+            message = f"Batch cancelled after {len(results)} of {len(filenames)} files; imported {imported} {noun}"
+        else:
+            message = f"Imported {imported} {noun} from {len(results) - failed} of {len(filenames)} files"
+        
+        return {
+            'success': len(results) == len(filenames) and not failed,
+            'message': message,
+            'imported': imported,
+            'skipped': sum(result['skipped'] for result in results.values()),
+            'errors': errors,
+            'files': results
+        }
+    
+    def _write_parsed(self, parsed, import_type, roster):
+        """Check one parsed file against the roster and commit it with its journal entry"""
+        if 'error' in parsed:
+            return self._failed(parsed['error'])
+        
+        columns, noun = BATCH_IMPORTS[import_type][2:]
+        entry = self.db.get_import_journal(parsed['file_hash'], import_type)
+        
+        if entry and entry[4] == 'complete':
             return {
                 'success': True,
-                'message': f"Successfully imported {imported} grades",
-                'imported': imported,
-                'skipped': skipped,
-                'errors': errors
-            }
-            
-        except Exception as e:
-            return {
-                'success': False,
-                'message': f"Import failed: {str(e)}",
+                'message': f"File already imported ({entry[2]} {noun}); nothing to do",
                 'imported': 0,
                 'skipped': 0,
                 'errors': []
             }
+        rows_done, chunks_done, total_imported, total_skipped, status, retry = entry or (0, 0, 0, 0, None, [])
+        
+        checked = parsed['checked']
+        if checked is None:
+            records, errors, rejected = [], [], []
+        else:
+            # Rows committed by an earlier run are left alone; rows it rejected are checked again
+            pending = (checked.index >= rows_done) | checked.index.isin(retry)
+            records, errors, rejected = apply_roster(checked[pending], roster, columns)
+        
+        try:
+            with self.db.transaction():
+                if import_type == 'grades':
+                    self.db.add_grades_bulk(records)
+                else:
+                    self.db.add_attendance_bulk(records)
+                self.db.record_import_progress(
+                    parsed['file_hash'], import_type, parsed['filename'], parsed['rows'],
+                    chunks_done + 1, total_imported + len(records), len(rejected),
+                    status='rejected' if rejected else 'complete', rejected=rejected
+                )
+        except Exception as e:
+            return self._failed(f"Import failed: {str(e)}")
+        
+        message = f"Successfully imported {len(records)} {noun}"
+        if retry:
+            message += f" (retried {len(retry)} previously rejected rows)"
+        
+        return {
+            'success': True,
+            'message': message,
+            'imported': len(records),
+            'skipped': len(errors),
+            'errors': errors
+        }
     
-    def import_attendance(self, filename):
+    def _import_file(self, filename, required_columns, import_chunk, noun, progress=None, journal=None):
         """
-        Import attendance from Excel file
+        Stream a file through import_chunk one chunk at a time
         
-        Expected columns: Student ID, Date, Status
-        Status should be: Present, Absent, Late, or Excused
+        import_chunk(df, roster) validates and inserts one chunk and returns
+        (imported, errors, rejected row indexes); each chunk commits in its
+        own transaction.
+        progress(rows_read, total_rows) is called after every chunk, where
+        total_rows is an estimate and may be None. On cancel the chunk in
+        flight is rolled back and earlier chunks stay committed.
+        
+        With journal set to an import type, each chunk also records its
+        progress in import_journal within the same transaction. Running the
+        same file again skips the rows that already committed and retries
+        the rows that were rejected (say for an unknown student), so a file
+        is only marked complete, and never loaded again, once every row is in.
         """
+        imported = 0
+        errors = []
+        resumed_from = 0
+        retry = []
+        
         try:
-            df = pd.read_excel(filename)
-            df.columns = df.columns.str.strip()
-            
-            # Validate required columns
-            required_columns = ['Student ID', 'Date', 'Status']
-            missing_columns = [col for col in required_columns if col not in df.columns]
-            
-            if missing_columns:
-                return {
-                    'success': False,
-                    'message': f"Missing required columns: {', '.join(missing_columns)}",
-                    'imported': 0,
-                    'skipped': 0,
-                    'errors': []
-                }
-            
-            # Remove empty rows
-            df = df.dropna(subset=['Student ID', 'Date', 'Status'])
-            
-            # Convert types
-            df['Student ID'] = df['Student ID'].astype(str).str.strip()
-            df['Status'] = df['Status'].astype(str).str.strip()
-            
-            imported = 0
-            skipped = 0
-            errors = []
-            
-            valid_statuses = ['Present', 'Absent', 'Late', 'Excused']
-            
-            for index, row in df.iterrows():
-                student_id = row['Student ID']
-                status = row['Status']
+            with ChunkedReader(filename, self.chunk_size) as reader:
+                # Validate required columns
+                missing_columns = [col for col in required_columns if col not in reader.columns]
+                if missing_columns:
+                    return self._failed(f"Missing required columns: {', '.join(missing_columns)}")
                 
-                # Parse date
-                try:
-                    if isinstance(row['Date'], str):
-                        date = pd.to_datetime(row['Date']).strftime("%Y-%m-%d")
-                    else:
-                        date = row['Date'].strftime("%Y-%m-%d")
-                except:
-                    errors.append(f"Row {index + 2}: Invalid date format")
-                    skipped += 1
-                    continue
+                if journal:
+                    digest = file_hash(filename)
+                    entry = self.db.get_import_journal(digest, journal)
+                    rows_done, chunks_done, total_imported, total_skipped, status, retry = \
+                        entry or (0, 0, 0, 0, None, [])
+                    rejected = set(retry)
+                    
+                    if status == 'complete':
+                        return {
+                            'success': True,
+                            'message': f"File already imported ({total_imported} {noun}); nothing to do",
+                            'imported': 0,
+                            'skipped': 0,
+                            'errors': []
+                        }
+                    
+                    # Rows committed by an earlier, interrupted run; only
+                    # skipped outright when none of them were rejected
+                    if rows_done and not retry:
+                        reader.skip(rows_done)
+                        resumed_from = reader.rows_read
                 
-                # Validate student exists
-                if not self.db.student_exists(student_id):
-                    errors.append(f"Row {index + 2}: Student {student_id} not found")
-                    skipped += 1
-                    continue
+                roster = self.db.get_student_ids()
                 
-                # Validate status
-                if status not in valid_statuses:
-                    errors.append(f"Row {index + 2}: Invalid status '{status}'")
-                    skipped += 1
-                    continue
+                for df in reader:
+                    if retry:
+                        df = df[(df.index >= rows_done) | df.index.isin(retry)]
+                    
+                    with self.db.transaction():
+                        chunk_imported, chunk_errors, chunk_rejected = import_chunk(df, roster)
+                        if self.cancelled and self.cancelled():
+                            raise ImportCancelled()
+                        
+                        if journal:
+                            chunks_done += 1
+                            total_imported += chunk_imported
+                            rejected.difference_update(df.index)
+                            rejected.update(chunk_rejected)
+                            self.db.record_import_progress(
+                                digest, journal, filename, max(reader.rows_read, rows_done),
+                                chunks_done, total_imported, len(rejected), rejected=rejected
+                            )
+                    imported += chunk_imported
+                    errors.extend(chunk_errors)
+                    
+                    if progress:
+                        progress(reader.rows_read, reader.total_rows)
                 
-                try:
-                    self.db.add_attendance(student_id, date, status)
-                    imported += 1
-                except Exception as e:
-                    errors.append(f"Row {index + 2}: {str(e)}")
-                    skipped += 1
+                if journal:
+                    self.db.record_import_progress(
+                        digest, journal, filename, reader.rows_read, chunks_done, total_imported,
+                        len(rejected), status='rejected' if rejected else 'complete', rejected=rejected
+                    )
+            
+            message = f"Successfully imported {imported} {noun}"
+            if resumed_from:
+                message += f" (resumed after row {resumed_from + 1})"
+            if retry:
+                message += f" (retried {len(retry)} previously rejected rows)"
             
             return {
                 'success': True,
-                'message': f"Successfully imported {imported} attendance records",
+                'message': message,
                 'imported': imported,
-                'skipped': skipped,
+                'skipped': len(errors),
                 'errors': errors
             }
             
-        except Exception as e:
+        except ImportCancelled:
             return {
                 'success': False,
-                'message': f"Import failed: {str(e)}",
-                'imported': 0,
-                'skipped': 0,
-                'errors': []
+                'message': f"Import cancelled after {imported} {noun}",
+                'imported': imported,
+                'skipped': len(errors),
+                'errors': errors
             }
+        except FileNotFoundError:
+            return self._failed("File not found")
+        except Exception as e:
+            if imported:
+                # Earlier chunks are committed, so report them even though this one failed
+                kept = ("run the import again to resume." if journal
+                        else "fix the file and import the remaining rows.")
+                return {
+                    'success': False,
+                    'message': (f"Import failed after {imported} {noun}: {str(e)}\n"
+                                f"Rows from earlier chunks were kept; {kept}"),
+                    'imported': imported,
+                    'skipped': len(errors),
+                    'errors': errors
+                }
+            return self._failed(f"Import failed: {str(e)}")
+    
+    @staticmethod
+    def _failed(message):
+        """Result dict for an import that did not run"""
+        return {
+            'success': False,
+            'message': message,
+            'imported': 0,
+            'skipped': 0,
+            'errors': []
+        }
+    
+    def _import_student_chunk(self, df, roster):
+        """Validate and insert one chunk of students"""
+        # Optional columns
+        if 'Course' not in df.columns:
+            df['Course'] = ''
+        if 'Email' not in df.columns:
+            df['Email'] = ''
+        
+        # Remove rows with empty Student ID or Name
+        df = df.dropna(subset=['Student ID', 'Name'])
+        
+        # Convert columns to clean strings
+        df['Student ID'] = clean_student_ids(df['Student ID'])
+        df['Name'] = df['Name'].astype(str).str.strip()
+        df['Course'] = df['Course'].fillna('').astype(str)
+        df['Email'] = df['Email'].fillna('').astype(str)
+        
+        # Anti-join against the roster: active IDs, or IDs repeated further
+        # up the file, are reported and skipped; inactive IDs are reactivated
+        duplicate = df['Student ID'].isin(roster) | df.duplicated(subset='Student ID')
+        
+        errors = [
+            f"Row {index + 2}: Student {student_id} already exists"
+            for index, student_id in df.loc[duplicate, 'Student ID'].items()
+        ]
+        rejected = df.index[duplicate].tolist()
+        new_students = df.loc[~duplicate, ['Student ID', 'Name', 'Course', 'Email']]
+        
+        # Insert the survivors with one executemany
+        self.db.add_students_bulk(new_students.itertuples(index=False, name=None))
+        roster.update(new_students['Student ID'])
+        
+        return len(new_students), errors, rejected
+    
+    def _import_grade_chunk(self, df, roster):
+        """Validate and insert one chunk of grades"""
+        grades, errors, rejected = apply_roster(validate_grades(df), roster, GRADE_COLUMNS)
+        self.db.add_grades_bulk(grades)
+        return len(grades), errors, rejected
+    
+    def _import_attendance_chunk(self, df, roster):
+        """Validate and insert one chunk of attendance records"""
+        records, errors, rejected = apply_roster(validate_attendance(df), roster, ATTENDANCE_COLUMNS)
+        self.db.add_attendance_bulk(records)
+        return len(records), errors, rejected
     
     def show_import_result(self, result, parent=None):
         """Display import results in a message box"""
+        from PyQt5.QtWidgets import QMessageBox
+        
         if result['success']:
             message = f"{result['message']}\n\n"
             message += f"✅ Imported: {result['imported']}\n"
@@ -0,0 +1,301 @@
+"""
+Background jobs for long-running imports and exports
+"""
+import os
+import queue
+import threading
+from multiprocessing import get_context
+from attendance_system.utils.readers import DEFAULT_CHUNK_SIZE
+
+
+class ImportJob:
+    """
+    Runs one import against its own database connection
+
+    SQLite connections cannot be shared across threads, so the job opens
+    a separate DBManager on the same file (with the bulk_load profile)
+    inside whichever thread calls run(). Qt drives run() from a QThread;
+    Tk and Kivy call start() and poll() from a timer on the UI thread.
+
+    filename may also be a list of grades or attendance files, which are
+    loaded together with ExcelImporter.batch_import. Progress is then
+    counted in files rather than rows; see unit.
+
+    With reimport set, the import journal entries of the files are cleared
+    first, so files that were already loaded are imported again in full.
+    """
+
+    IMPORTERS = {
+        'Students': 'import_students',
+        'Students (Sync)': 'sync_students',
+        'Grades': 'import_grades',
+        'Attendance': 'import_attendance',
+    }
+
+    def __init__(self, db_path, import_type, filename, chunk_size=DEFAULT_CHUNK_SIZE, reimport=False):
+        if import_type not in self.IMPORTERS:
+            raise ValueError(f"Unknown import type: {import_type}")
+
+        self.db_path = db_path
+        self.import_type = import_type
+        self.filename = filename
+        self.batch = isinstance(filename, (list, tuple))
+        self.unit = 'files' if self.batch else 'rows'
+        self.chunk_size = chunk_size
+        self.reimport = reimport
+        self.result = None
+        self.events = queue.Queue()
+        self._cancelled = threading.Event()
+        self._thread = None
+
+    def run(self, progress=None):
+        """Run the import in the calling thread and return its result dict"""
+        from attendance_system.database.db_manager import DBManager
+        from attendance_system.utils.imports import ExcelImporter
+        from attendance_system.utils.readers import file_hash
+
+        db = None
+        try:
+            db = DBManager(self.db_path, profile='bulk_load')
+            if self.reimport:
+                for filename in (self.filename if self.batch else [self.filename]):
+                    db.clear_import_journal(file_hash(filename))
+            importer = ExcelImporter(db, self.chunk_size, cancelled=self._cancelled.is_set)
+            if self.batch:
+                self.result = importer.batch_import(
+                    self.filename, self.import_type.lower(), progress=progress
+                )
+            else:
+                import_file = getattr(importer, self.IMPORTERS[self.import_type])
+                self.result = import_file(self.filename, progress=progress)
+        except Exception as e:
+            self.result = ExcelImporter._failed(f"Import failed: {str(e)}")
+        finally:
+            if db is not None:
+                db.close()
+
+        return self.result
+
+    def start(self):
+        """Run the import on a daemon thread, reporting through poll()"""
+        self._thread = threading.Thread(target=self._run_in_thread, daemon=True)
+        self._thread.start()
+
+    def _run_in_thread(self):
+        result = self.run(progress=lambda rows_read, total_rows:
+                          self.events.put(('progress', rows_read, total_rows)))
+        self.events.put(('done', result))
+
+    def poll(self):
+        """Drain pending ('progress', rows_read, total_rows) and ('done', result) events"""
+        events = []
+        while True:
+            try:
+                events.append(self.events.get_nowait())
+            except queue.Empty:
+                return events
+
+    def cancel(self):
+        """Ask the import to stop; the chunk in flight is rolled back"""
+        self._cancelled.set()
+
+    @property
+    def cancelled(self):
+        return self._cancelled.is_set()
+
+
+
+class ExportJob:
+    """
+    Builds one Excel export in a worker process
+
+    openpyxl holds the GIL for the whole workbook build and save, so a
+    thread would still freeze the UI; a spawned process does not. The
+    worker opens the database read-only and reads everything from a
+    single snapshot, so rows written from the UI meanwhile cannot leave
+    the sheets disagreeing with each other.
+
+    The workbook is written next to filename with a .part suffix and
+    renamed once complete, so a cancelled or failed export never leaves
+    a truncated file behind. All three UIs call start() and then poll()
+    from a timer.
+
+    With a cache_key from ExportCache.key(), an export of unchanged data
+    is copied out of exports.export_cache without starting a worker, and
+    a fresh one is stored there once it completes.
+    """
+
+    # export type -> (function in utils.exports, get_database_info() counts
+    # summed into the row estimate)
+    EXPORTERS = {
+        'Students': ('export_students', ('total_students',)),
+        'Grades': ('export_grades', ('total_grades',)),
+        'Attendance': ('export_attendance_detailed', ('total_attendance',)),
+        'Attendance Matrix': ('export_attendance_matrix', ('total_students',)),
+        'Report': ('export_report', ('total_students',)),
+        'Term Package': ('export_term_package',
+                         ('total_students', 'total_grades', 'total_attendance', 'total_students')),
+    }
+
+    def __init__(self, db_path, export_type, filename, cache_key=None):
+        if export_type not in self.EXPORTERS:
+            raise ValueError(f"Unknown export type: {export_type}")
+
+        if not filename.endswith('.xlsx'):
+            filename += '.xlsx'
+
+        self.db_path = db_path
+        self.export_type = export_type
+        self.filename = filename
+        self.part_filename = filename[:-len('.xlsx')] + '.part.xlsx'
+        self.cache_key = cache_key
+        self.result = None
+        self._ready = []
+        self._context = get_context('spawn')
+        self._events = None
+        self._process = None
+        self._cancelled = False
+
+    def run(self, progress=None):
+        """Build the export in the calling process and return its result dict"""
+        from attendance_system.database.db_manager import DBManager
+        from attendance_system.utils import exports
+
+        function_name, count_keys = self.EXPORTERS[self.export_type]
+        db = None
+        try:
+            db = DBManager(self.db_path, read_only=True)
+            report = None
+            if progress is not None:
+                info = db.get_database_info()
+                total_rows = sum(info[key] for key in count_keys)
+                report = lambda rows_written: progress(rows_written, total_rows)
+
+            if getattr(exports, function_name)(db, self.part_filename, progress=report) is False:
+                raise RuntimeError("the exporter reported an error")
+            os.replace(self.part_filename, self.filename)
+            self.result = {
+                'success': True,
+                'message': f"{self.export_type} exported to {self.filename}",
+                'filename': self.filename,
+            }
+        except Exception as e:
+            self._remove_part_file()
+            self.result = self._failed(f"Export failed: {str(e)}")
+        finally:
+            if db is not None:
+                db.close()
+
+        return self.result
+
+    def start(self):
+        """Run the export in a spawned worker process, reporting through poll()"""
+        from attendance_system.utils.exports import export_cache
+
+        if self.cache_key is not None and export_cache.fetch(self.cache_key, self.filename):
+            self.result = {
+                'success': True,
+                'message': f"{self.export_type} exported to {self.filename} (unchanged since last export)",
+                'filename': self.filename,
+            }
+            self._ready.append(('done', self.result))
+            return
+
+        self._events = self._context.Queue()
+        self._process = self._context.Process(
+            target=_run_export_job, args=(self.db_path, self.export_type, self.filename, self._events),
+            daemon=True
+        )
+        self._process.start()
+
+    def poll(self):
+        """Drain pending ('progress', rows_written, total_rows) and ('done', result) events"""
+        if self._ready:
+            events, self._ready = self._ready, []
+            return events
+        if self._process is None:
+            return []
+
+        events = []
+        if self._drain(events):
+            return events
+
+        if not self._process.is_alive():
+            # The worker may have reported and exited since the drain above
+            if self._drain(events):
+                return events
+
+            # The worker died without reporting, e.g. it was cancelled
+            exitcode = self._process.exitcode
+            self._finish()
+            self._remove_part_file()
+            if self._cancelled:
+                self.result = self._failed("Export cancelled")
+            else:
+                self.result = self._failed(f"Export worker exited with code {exitcode}")
+            events.append(('done', self.result))
+        return events
+
+    def _drain(self, events):
+        """Move queued worker events into events; True once 'done' has been handled"""
+        while True:
+            try:
+                event = self._events.get_nowait()
+            except queue.Empty:
+                return False
+            events.append(event)
+            if event[0] == 'done':
+                self._finish()
+                self.result = event[1]
+                if self.result['success'] and self.cache_key is not None:
+                    from attendance_system.utils.exports import export_cache
+                    export_cache.store(self.cache_key, self.filename)
+                return True
+
+    def cancel(self):
+        """Stop the worker; the partial file is removed on the next poll()"""
+        self._cancelled = True
+        if self._process is not None and self._process.is_alive():
+            self._process.terminate()
+
+    @property
+    def cancelled(self):
+        return self._cancelled
+
+    def _finish(self):
+        """Reap the worker once it has reported or died"""
+        self._process.join()
+        self._process = None
+        self._events.close()
+
+    def _remove_part_file(self):
+        try:
+            os.remove(self.part_filename)
+        except OSError:
+            pass
+
+    @staticmethod
+    def _failed(message):
+        """Result dict for an export that did not complete"""
+        return {
+            'success': False,
+            'message': message,
+            'filename': None,
+        }
+
+
+def _run_export_job(db_path, export_type, filename, events):
+    """Worker process entry point for ExportJob.start()"""
+    job = ExportJob(db_path, export_type, filename)
+    result = job.run(progress=lambda rows_written, total_rows:
+                     events.put(('progress', rows_written, total_rows)))
+    events.put(('done', result))
+
+
+def progress_text(done, total, unit='rows'):
+    """Human-readable progress for a status label"""
+    if total:
+        percent = min(done / total * 100, 100)
+        approx = '~' if unit == 'rows' else ''
+        return f"Processed {done:,} of {approx}{total:,} {unit} ({percent:.0f}%)"
+    return f"Processed {done:,} {unit}"
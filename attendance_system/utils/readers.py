@@ -0,0 +1,188 @@
+"""
+Chunked readers for import files
+"""
+import os
+import csv
+import codecs
+import hashlib
+from itertools import islice
+import pandas as pd
+from openpyxl import load_workbook
+
+# Rows per chunk; peak memory of an import follows this, not the file size
+DEFAULT_CHUNK_SIZE = 5000
+
+# Extensions read through the csv module instead of a workbook reader
+TEXT_EXTENSIONS = ('.csv', '.tsv', '.txt')
+
+# Bytes sampled to detect the encoding and delimiter of text files
+SNIFF_BYTES = 64 * 1024
+
+_BOMS = [
+    (codecs.BOM_UTF8, 'utf-8-sig'),
+    (codecs.BOM_UTF16_LE, 'utf-16'),
+    (codecs.BOM_UTF16_BE, 'utf-16'),
+]
+
+
+def file_hash(filename, block_size=1024 * 1024):
+    """SHA-256 of a file's contents, identifying it across renames"""
+    digest = hashlib.sha256()
+    with open(filename, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def detect_encoding(sample):
+    """
+    Guess the encoding of a text file from its first bytes
+    A byte order mark wins; otherwise UTF-8 if the sample decodes,
+    falling back to cp1252 (what Excel on Windows saves as "CSV")
+    """
+    for bom, encoding in _BOMS:
+        if sample.startswith(bom):
+            return encoding
+
+    try:
+        sample.decode('utf-8')
+    except UnicodeDecodeError as e:
+        # A full-size sample may end in the middle of a multi-byte character;
+        # a shorter one is the whole file, so any bad byte counts
+        if len(sample) < SNIFF_BYTES or e.start < len(sample) - 3:
+            return 'cp1252'
+    return 'utf-8'
+
+
+def decodes_as_utf8(filename, block_size=1024 * 1024):
+    """Whether a whole file is valid UTF-8, checked block by block"""
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    with open(filename, 'rb') as f:
+        try:
+            for block in iter(lambda: f.read(block_size), b''):
+                decoder.decode(block)
+            decoder.decode(b'', final=True)
+        except UnicodeDecodeError:
+            return False
+    return True
+
+
+def detect_delimiter(sample, extension):
+    """Sniff the delimiter of a text sample, defaulting by extension"""
+    try:
+        return csv.Sniffer().sniff(sample, delimiters=',\t;|').delimiter
+    except csv.Error:
+        return '\t' if extension == '.tsv' else ','
+
+
+class ChunkedReader:
+    """
+    Reads the first sheet of an import file as DataFrames of at most
+    chunk_size rows. Workbooks are streamed through openpyxl's read-only
+    mode, so only one chunk is held in memory at a time.
+
+    CSV and TSV files are streamed through csv.reader with the delimiter
+    and encoding sniffed from the start of the file. Their cells arrive as
+    strings, with empty cells turned into None so blank-row checks behave
+    the same as for workbooks.
+
+    Each chunk is indexed by its position among the data rows, so
+    `index + 2` is still the spreadsheet row number in error messages.
+    """
+
+    def __init__(self, filename, chunk_size=DEFAULT_CHUNK_SIZE):
+        self.filename = filename
+        self.chunk_size = chunk_size
+        self.columns = []
+        self.total_rows = None
+        self.rows_read = 0
+        self._workbook = None
+        self._file = None
+        self._rows = iter(())
+
+    def __enter__(self):
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def open(self):
+        """Open the file and read its header row"""
+        extension = os.path.splitext(self.filename)[1].lower()
+
+        if extension in TEXT_EXTENSIONS:
+            header = self._open_text(extension)
+        elif extension in ('.xlsx', '.xlsm'):
+            self._workbook = load_workbook(self.filename, read_only=True, data_only=True)
+            ws = self._workbook.worksheets[0]
+            self._rows = ws.iter_rows(values_only=True)
+            header = next(self._rows, None) or ()
+
+            # The stored sheet dimension is only a hint, so this is an estimate
+            if ws.max_row:
+                self.total_rows = max(ws.max_row - 1, 0)
+        else:
+            # Legacy .xls cannot be streamed; pandas reads it whole
+            df = pd.read_excel(self.filename)
+            header = list(df.columns)
+            self._rows = df.itertuples(index=False, name=None)
+            self.total_rows = len(df)
+
+        self.columns = [
+            str(name).strip() if name is not None else f"Unnamed: {i}"
+            for i, name in enumerate(header)
+        ]
+
+    def _open_text(self, extension):
+        """Open a CSV/TSV file and return its header row"""
+        with open(self.filename, 'rb') as f:
+            raw = f.read(SNIFF_BYTES)
+        encoding = detect_encoding(raw)
+        # The sample only covers the start of a large file; check the rest
+        # before any chunk commits rather than fail halfway through
+        if encoding == 'utf-8' and len(raw) == SNIFF_BYTES and not decodes_as_utf8(self.filename):
+            encoding = 'cp1252'
+        sample = raw.decode(encoding, errors='ignore')
+
+        self._file = open(self.filename, newline='', encoding=encoding)
+        reader = csv.reader(self._file, delimiter=detect_delimiter(sample, extension))
+        # Blank lines are kept as empty rows so row numbers stay aligned
+        self._rows = ([cell if cell != '' else None for cell in row] for row in reader)
+
+        # Estimate the row count from the average line length of the sample
+        lines = sample.count('\n')
+        if lines and len(raw) < SNIFF_BYTES:
+            self.total_rows = max(lines - 1, 0)
+        elif lines:
+            self.total_rows = int(os.path.getsize(self.filename) * lines / len(raw)) - 1
+
+        return next(self._rows, None) or ()
+
+    def close(self):
+        """Release the workbook or text file"""
+        if self._workbook is not None:
+            self._workbook.close()
+            self._workbook = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def skip(self, rows):
+        """Discard the next data rows without building DataFrames for them"""
+        self.rows_read += sum(1 for _ in islice(self._rows, rows))
+
+    def __iter__(self):
+        width = len(self.columns)
+
+        while True:
+            batch = list(islice(self._rows, self.chunk_size))
+            if not batch:
+                return
+
+            # Read-only sheets may return short rows; pad them to the header
+            rows = [tuple(row[:width]) + (None,) * (width - len(row)) for row in batch]
+            start = self.rows_read
+            self.rows_read += len(rows)
+
+            yield pd.DataFrame(rows, columns=self.columns, index=range(start, self.rows_read))